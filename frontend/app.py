@@ -4,36 +4,88 @@ Online Exam Proctoring System - Flask Frontend
 Provides web UI for teachers and students
 """
 
+# Cooperative concurrency: when gevent is available, patch blocking I/O so
+# each SSE client costs a greenlet (~KB) instead of an OS worker thread (~MB)
+try:
+    from gevent import monkey
+    monkey.patch_all()
+    GEVENT_ENABLED = True
+except ImportError:
+    GEVENT_ENABLED = False
+
+import io
+import sys
+import gzip
 import json
 import time
+import socket
+import hashlib
+import itertools
 import threading
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 import xmlrpc.client
 
+# orjson is a C-accelerated serializer (~5-10x stdlib json); the SSE and
+# jsonify hot paths use it when installed and fall back transparently
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# RFC 6902 diffs let SSE ticks send ~50-byte patches instead of the full
+# students dict; without the library every tick falls back to snapshots
+try:
+    import jsonpatch
+except ImportError:
+    jsonpatch = None
+
 app = Flask(__name__)
 
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class OrJSONProvider(JSONProvider):
+        """Route jsonify through orjson"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrJSONProvider(app)
+
 # Configuration
 SERVER_URL = "http://127.0.0.1:8010"
 LOAD_BALANCER_URL = "http://127.0.0.1:9010"
 
+# Lamport timestamps for CS requests: a GIL-atomic counter seeded from the
+# wall clock, so each request costs one C-level increment instead of a
+# time.time() syscall plus int/str conversions
+_lamport = itertools.count(int(time.time() * 1000))
+
 # Global state
 current_server = None
-server_proxy = None
-load_balancer_proxy = None
+
+# xmlrpc.client transports cache a keep-alive connection per instance and
+# are not thread-safe, so each Flask worker thread gets its own proxy pair
+_tls = threading.local()
 
 def get_server_proxy():
-    """Get server proxy (direct or through load balancer)"""
-    global server_proxy, load_balancer_proxy
-    
+    """Get a per-thread server proxy (direct or through load balancer)"""
     if current_server == "load_balancer":
-        if not load_balancer_proxy:
-            load_balancer_proxy = xmlrpc.client.ServerProxy(LOAD_BALANCER_URL, allow_none=True)
-        return load_balancer_proxy
+        proxy = getattr(_tls, 'load_balancer_proxy', None)
+        if proxy is None:
+            proxy = xmlrpc.client.ServerProxy(LOAD_BALANCER_URL, allow_none=True)
+            _tls.load_balancer_proxy = proxy
+        return proxy
     else:
-        if not server_proxy:
-            server_proxy = xmlrpc.client.ServerProxy(SERVER_URL, allow_none=True)
-        return server_proxy
+        proxy = getattr(_tls, 'server_proxy', None)
+        if proxy is None:
+            proxy = xmlrpc.client.ServerProxy(SERVER_URL, allow_none=True)
+            _tls.server_proxy = proxy
+        return proxy
 
 def rpc_call(method: str, *args):
     """Call RPC either directly or via load balancer invoke()"""
@@ -143,12 +195,35 @@ def api_submit_exam():
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+@app.route('/api/dashboard')
+def api_dashboard():
+    """Combined status + timer (+ balancer stats) in one backend call"""
+    try:
+        result = rpc_call('get_dashboard')
+
+        if current_server == "load_balancer":
+            try:
+                result["stats"] = get_server_proxy().get_stats()
+            except Exception:
+                result["stats"] = None
+
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
 @app.route('/api/get_questions')
 def api_get_questions():
-    """Fetch questions for the exam"""
+    """Fetch questions for the exam, revalidating against the backend ETag"""
     try:
-        result = rpc_call('get_questions')
-        return jsonify(result)
+        etag = rpc_call('get_questions_etag')
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304
+
+        resp = jsonify(rpc_call('get_questions'))
+        resp.headers['ETag'] = etag
+        resp.headers['Cache-Control'] = 'private, max-age=300'
+        return resp
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
@@ -180,6 +255,26 @@ def api_submit_answer():
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+@app.route('/api/submit_answers_batch', methods=['POST'])
+def api_submit_answers_batch():
+    """Submit a coalesced batch of autosaved answers"""
+    try:
+        data = request.get_json()
+        roll = data.get('roll')
+        answers = data.get('answers')
+        mode = data.get('mode', 'autosave')
+
+        if not roll or not answers:
+            return jsonify({"success": False, "message": "roll, answers required"})
+
+        # Stringify timestamps: JS epoch-ms values overflow XML-RPC int
+        # limits; the server coerces them back
+        answers = [[qid, ans, str(ts)] for qid, ans, ts in answers]
+        result = rpc_call('submit_answers_batch', roll, answers, mode)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
 @app.route('/api/request_cs', methods=['POST'])
 def api_request_cs():
     """Request critical section access"""
@@ -191,7 +286,7 @@ def api_request_cs():
             return jsonify({"success": False, "message": "Roll number required"})
         
         # Send timestamp as string to avoid XML-RPC i4 limits
-        result = rpc_call('request_cs', roll, str(int(time.time() * 1000)))
+        result = rpc_call('request_cs', roll, str(next(_lamport)))
         return jsonify(result)
         
     except Exception as e:
@@ -259,65 +354,139 @@ def api_get_balancer_stats():
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+# SSE clients are cut off after this much time without a state change;
+# browsers reconnect with Last-Event-ID so nothing is lost
+SSE_IDLE_TIMEOUT = 300
+
 @app.route('/api/events')
 def api_events():
     """Server-sent events for real-time updates"""
+    # Resume from the client's last seen version after a reconnect
+    try:
+        resume_version = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        resume_version = -1
+
     def event_stream():
-        while True:
+        # Long-poll the server instead of polling every 2 seconds: the RPC
+        # blocks until the state version moves (or times out as a heartbeat)
+        last_version = resume_version
+        last_hash = None
+        last_data = None
+        last_activity = time.monotonic()
+        while time.monotonic() - last_activity < SSE_IDLE_TIMEOUT:
             try:
-                proxy = get_server_proxy()
-                result = proxy.get_status()
-                
+                result = rpc_call('wait_for_change', last_version, 25)
+
                 if result.get("success"):
-                    data = {
-                        "timestamp": datetime.now().isoformat(),
+                    last_version = result.get("version", last_version)
+                    core = {
                         "students": result.get("students", {}),
                         "exam_started": result.get("exam_started", False),
                         "exam_ended": result.get("exam_ended", False),
-                        "cs_holder": result.get("cs_holder")
+                        "cs_holder": result.get("cs_holder"),
+                        "timer": result.get("timer"),
+                        "version": last_version
                     }
-                    yield f"data: {json.dumps(data)}\n\n"
-                
-                time.sleep(2)  # Update every 2 seconds
-                
+
+                    # Don't resend identical frames (e.g. heartbeat timeouts)
+                    if orjson is not None:
+                        core_bytes = orjson.dumps(core)
+                    else:
+                        core_bytes = json.dumps(core, sort_keys=True).encode()
+                    frame_hash = hashlib.blake2b(core_bytes, digest_size=8).digest()
+                    if frame_hash == last_hash:
+                        continue
+                    last_hash = frame_hash
+                    last_activity = time.monotonic()
+
+                    # Tag every frame with the version so reconnects resume
+                    event_id = f"id: {last_version}\n".encode()
+                    data = dict(core, timestamp=datetime.now().isoformat())
+                    if jsonpatch is not None and last_data is not None:
+                        # Diff against the last sent snapshot; clients apply
+                        # the patch to their local copy
+                        patch_ops = jsonpatch.make_patch(last_data, data).patch
+                        last_data = data
+                        if not patch_ops:
+                            continue
+                        if orjson is not None:
+                            payload = orjson.dumps(patch_ops)
+                        else:
+                            payload = json.dumps(patch_ops).encode()
+                        yield event_id + b"event: patch\ndata: " + payload + b"\n\n"
+                    else:
+                        # First event (or no jsonpatch): full snapshot baseline
+                        last_data = data
+                        if orjson is not None:
+                            yield event_id + b"data: " + orjson.dumps(data) + b"\n\n"
+                        else:
+                            yield event_id + f"data: {json.dumps(data)}\n\n".encode()
+
             except Exception as e:
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                yield f"data: {json.dumps({'error': str(e)})}\n\n".encode()
                 time.sleep(5)
-    
-    return Response(event_stream(), mimetype='text/event-stream')
+
+    def gzip_stream(generator):
+        """Deflate each SSE frame as it is emitted"""
+        buf = io.BytesIO()
+        gz = gzip.GzipFile(mode='wb', fileobj=buf)
+        for chunk in generator:
+            gz.write(chunk)
+            gz.flush()
+            compressed = buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            if compressed:
+                yield compressed
+
+    stream = stream_with_context(event_stream())
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(gzip_stream(stream), mimetype='text/event-stream')
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+    return Response(stream, mimetype='text/event-stream')
 
 if __name__ == '__main__':
     # Initialize with direct server
     current_server = "direct"
-    
+
     print("Starting Flask frontend...")
     print(f"Server URL: {SERVER_URL}")
     print(f"Load Balancer URL: {LOAD_BALANCER_URL}")
-    
-    # Try different ports if 5000 is occupied
-    ports_to_try = [5001, 5002, 5003, 5004, 5005, 5000]  # Start with 5001 to avoid ControlCenter
+
+    # Probe for a free port with a cheap bind test instead of spinning up
+    # the whole WSGI stack just to find out the port is taken
     port = None
-    
-    for p in ports_to_try:
+    for candidate in (5001, 5002, 5003, 5004, 5005, 5000):
+        probe = socket.socket()
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
-            print(f"Trying port {p}...")
-            app.run(debug=True, host='0.0.0.0', port=p, use_reloader=False)
-            port = p
+            probe.bind(('0.0.0.0', candidate))
+            port = candidate
             break
-        except OSError as e:
-            if "Address already in use" in str(e):
-                print(f"Port {p} is already in use, trying next port...")
-                continue
-            else:
-                print(f"Error starting on port {p}: {e}")
-                break
-        except Exception as e:
-            print(f"Unexpected error starting on port {p}: {e}")
-            break
-    
-    if port:
-        print(f"✓ Flask application started successfully on port {port}")
-        print(f"Access the application at: http://localhost:{port}")
+        except OSError:
+            continue
+        finally:
+            probe.close()
+
+    if port is None:
+        print("✗ No free port available in 5000-5005")
+        sys.exit(1)
+
+    print(f"Access the application at: http://localhost:{port}")
+
+    # Prefer gevent (cooperative SSE fan-out), then waitress (real thread
+    # pool); the Werkzeug dev server handles one request at a time
+    if GEVENT_ENABLED:
+        from gevent.pywsgi import WSGIServer
+        print(f"Serving with gevent on port {port}...")
+        WSGIServer(('0.0.0.0', port), app).serve_forever()
     else:
-        print("✗ Failed to start Flask application on any available port")
-        print("Please check if any other services are using ports 5000-5005")
+        try:
+            from waitress import serve
+            print(f"Serving with waitress (16 threads) on port {port}...")
+            serve(app, host='0.0.0.0', port=port, threads=16)
+        except ImportError:
+            print("waitress not installed, falling back to threaded dev server...")
+            app.run(host='0.0.0.0', port=port, threaded=True, use_reloader=False)
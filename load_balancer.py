@@ -4,14 +4,35 @@ Online Exam Proctoring System - Load Balancer
 Implements least-connections load balancing for multiple server replicas
 """
 
+import sys
+import heapq
 import itertools
+import queue
+import random
 import threading
 import logging
 import time
+import socket
+import weakref
+from array import array
+import http.client
+import socketserver
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
+from urllib.parse import urlparse
 from xmlrpc.server import SimpleXMLRPCServer
 import xmlrpc.client
 
+try:
+    import msgpack
+except ImportError:
+    # Binary RPC fast path is optional; XML-RPC remains the wire format
+    msgpack = None
+
+# Coordinators expose a MessagePack RPC listener at their port plus this
+# offset (clear of the 9000-range balancer ports and the autosave channel)
+BINARY_RPC_PORT_OFFSET = 3000
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,70 +40,501 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ThreadedXMLRPCServer(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    """XML-RPC server that handles each request in its own thread
+
+    A plain SimpleXMLRPCServer serializes all clients on one accept loop,
+    capping the balancer at a single in-flight request regardless of how
+    many backends exist. Requests run on a fixed worker pool rather than
+    a freshly spawned thread per connection, so concurrency is bounded
+    and thread start-up cost stays off the request path.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    pool_size = 32
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._request_pool = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="rpc-worker"
+        )
+
+    def process_request(self, request, client_address):
+        # ThreadingMixIn's per-request thread spawn, redirected to the pool
+        self._request_pool.submit(
+            self.process_request_thread, request, client_address
+        )
+
+    def server_close(self):
+        super().server_close()
+        self._request_pool.shutdown(wait=False)
+
+    def server_bind(self):
+        # SO_REUSEPORT lets additional balancer processes share the port
+        # for scale-out where the platform supports it
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        super().server_bind()
+
+    def get_request(self):
+        # Disable Nagle on accepted sockets; small XML-RPC responses
+        # otherwise wait out the delayed-ACK timer
+        request, client_address = super().get_request()
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return request, client_address
+
+class KeepAliveTransport(xmlrpc.client.Transport):
+    """HTTP transport that reuses one persistent connection per host"""
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.accept_gzip_encoding = True
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        # Reuse the cached connection instead of opening a new socket per RPC
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        chost, self._extra_headers, x509 = self.get_host_info(host)
+        self._connection = host, http.client.HTTPConnection(chost, timeout=self.timeout)
+        return self._connection[1]
+
+class _FastPathUnavailable(Exception):
+    """Binary fast-path failure before the request reached the backend"""
+
 class LoadBalancer:
     """Least-connections load balancer for exam coordinator replicas"""
     
     def __init__(self, backends: List[str], port: int = 9010):
-        self.backends = backends
+        # Interned URL keys cache their hash, so the dict lookups that key
+        # on backend URLs stop rehashing the full string every access
+        self.backends = [sys.intern(b) for b in backends]
+        backends = self.backends
         self.port = port
         self.lock = threading.Lock()
         self.backend_status = {backend: True for backend in backends}
-        self.request_count = {backend: 0 for backend in backends}
-        self.inflight = {backend: 0 for backend in backends}
-        
+        # Maintained incrementally on health transitions so selection never
+        # re-filters the full backend list
+        self._healthy = list(backends)
+
+        # Structure-of-arrays counters: backend URL hashes once into an
+        # index, then reads/writes are C-level array accesses
+        self._idx = {backend: i for i, backend in enumerate(backends)}
+        self._inflight = array('i', [0] * len(backends))
+        self._reqcnt = array('q', [0] * len(backends))
+        # Request totals are stats, not selection state: bump them through
+        # GIL-atomic itertools.count generators outside the selection lock
+        self._rc_next = [itertools.count(1).__next__ for _ in backends]
+
+        # Min-heap of (inflight, request_count, backend, version) entries so
+        # least-connections picks are O(log N) instead of a full scan. Stale
+        # entries are invalidated lazily via the per-backend version counter.
+        self._select_lock = threading.Lock()
+        self._heap = []
+        self._heap_version = {backend: 0 for backend in backends}
+        for backend in backends:
+            heapq.heappush(self._heap, (0, 0, backend, 0))
+
         # Health check settings
         self.health_check_interval = 30  # seconds
         self.health_check_timeout = 5  # seconds
-        
+
+        # Adaptive probe scheduling: intervals back off while a backend
+        # stays healthy and snap short the moment it fails
+        self.health_check_min_interval = 5.0  # seconds, after a transition
+        self.health_check_max_interval = 60.0  # seconds, steady-state cap
+        self.health_check_failure_interval = 1.0  # seconds, while failing
+        self._probe_interval = {b: self.health_check_min_interval for b in backends}
+        self._next_probe = {b: 0.0 for b in backends}  # probe immediately
+        self._last_ok_dispatch: Dict[str, float] = {}
+
+        # Set on shutdown; wakes the health worker out of its wait instantly
+        self._stop = threading.Event()
+
+        # Above this many healthy backends, use power-of-two-choices instead
+        # of exact least-connections so selection stays O(1) as the pool grows
+        self.p2c_threshold = 4
+
+        # Probe all backends concurrently so a health round costs max(check)
+        # rather than sum(check)
+        self._health_executor = ThreadPoolExecutor(
+            max_workers=max(len(backends), 1),
+            thread_name_prefix="health-check"
+        )
+
+        # Keep-alive proxy pool: reuse connections instead of one per dispatch
+        self.conn_pool_max_size = 8
+        self._proxy_pool: Dict[str, queue.Queue] = {}
+        for backend in backends:
+            self._init_proxy_pool(backend)
+
+        # Pooled sockets for the binary (MessagePack) fast path; a backend
+        # that refuses the binary port is pinned to XML-RPC
+        self._binary_pool: Dict[str, queue.Queue] = {}
+        self._binary_ok: Dict[str, bool] = {}
+
+        # Short-TTL memoization for idempotent read RPCs so polling bursts
+        # are absorbed at the balancer instead of hitting a backend each time
+        self.read_rpc_ttl = {
+            "get_status": 0.5,
+            "get_exam_timer": 0.5,
+            "get_dashboard": 0.5,
+            "get_questions": 5.0,
+        }
+        self._rcache: Dict[tuple, tuple] = {}
+        self._rcache_lock = threading.Lock()
+
+        # Single-flight: concurrent identical read RPCs share one backend
+        # call instead of each opening their own
+        self._inflight_calls: Dict[tuple, Future] = {}
+        self._sf_lock = threading.Lock()
+
+        # Dedicated probe proxies with a bounded timeout so a hung backend
+        # costs a health round at most health_check_timeout, never a stalled
+        # dispatch connection
+        self._probe_proxies: Dict[str, xmlrpc.client.ServerProxy] = {}
+
+        # Memoized method handles per proxy: ServerProxy.__getattr__ builds
+        # a fresh _Method object on every lookup. Entries vanish with their
+        # proxy, so removed backends need no explicit invalidation.
+        self._method_cache = weakref.WeakKeyDictionary()
+
         logger.info(f"Load balancer initialized with {len(backends)} backends")
         logger.info(f"Backends: {backends}")
     
+    def _init_proxy_pool(self, backend: str):
+        """Create the keep-alive proxy pool for a backend (filled lazily)"""
+        self._proxy_pool[backend] = queue.Queue(maxsize=self.conn_pool_max_size)
+
+    def _drain_proxy_pool(self, backend: str):
+        """Close and discard all pooled proxies for a backend"""
+        pool = self._proxy_pool.pop(backend, None)
+        if pool is not None:
+            while True:
+                try:
+                    proxy = pool.get_nowait()
+                except queue.Empty:
+                    break
+                proxy("close")()
+        binary_pool = self._binary_pool.pop(backend, None)
+        self._binary_ok.pop(backend, None)
+        if binary_pool is not None:
+            while True:
+                try:
+                    sock = binary_pool.get_nowait()
+                except queue.Empty:
+                    break
+                sock.close()
+
+    def _binary_call(self, backend: str, method: str, params: tuple):
+        """Run an RPC over the backend's MessagePack listener
+
+        Frames are length-prefixed msgpack: request (method, params),
+        response (ok, payload). Raises _FastPathUnavailable only when the
+        request provably never reached the backend (connect failure or
+        partial send of the length-prefixed frame); once the frame is
+        delivered the backend may execute the call, so response-phase
+        failures propagate rather than trigger an XML-RPC re-issue.
+        """
+        pool = self._binary_pool.setdefault(
+            backend, queue.Queue(maxsize=self.conn_pool_max_size)
+        )
+        try:
+            sock = pool.get_nowait()
+        except queue.Empty:
+            parsed = urlparse(backend)
+            try:
+                sock = socket.create_connection(
+                    (parsed.hostname, parsed.port + BINARY_RPC_PORT_OFFSET),
+                    timeout=self.health_check_timeout
+                )
+            except ConnectionRefusedError:
+                # No binary listener at all; the caller pins this backend
+                raise
+            except OSError as e:
+                raise _FastPathUnavailable() from e
+            # The timeout only bounds connect; responses may legitimately
+            # take longer than any probe deadline, so reads stay blocking
+            sock.settimeout(None)
+        payload = msgpack.packb((method, list(params)), use_bin_type=True)
+        try:
+            sock.sendall(len(payload).to_bytes(4, "big") + payload)
+        except Exception as e:
+            # The backend reads exactly len(payload) bytes before acting,
+            # so a partial send is never executed and a retry is safe
+            sock.close()
+            raise _FastPathUnavailable() from e
+        try:
+            header = self._recv_exact(sock, 4)
+            body = self._recv_exact(sock, int.from_bytes(header, "big"))
+        except Exception:
+            sock.close()
+            raise
+        try:
+            pool.put_nowait(sock)
+        except queue.Full:
+            sock.close()
+        ok, result = msgpack.unpackb(body, raw=False)
+        if not ok:
+            raise xmlrpc.client.Fault(1, str(result))
+        return result
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, n: int) -> bytes:
+        """Read exactly n bytes from a socket"""
+        chunks = []
+        while n > 0:
+            chunk = sock.recv(n)
+            if not chunk:
+                raise OSError("binary RPC connection closed")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b"".join(chunks)
+
+    def _method_handle(self, proxy, method: str):
+        """Return a memoized bound RPC method for a proxy"""
+        try:
+            cache = self._method_cache[proxy]
+        except KeyError:
+            cache = self._method_cache[proxy] = {}
+        except TypeError:
+            # Proxy type doesn't support weak references; look up directly
+            return getattr(proxy, method)
+        handle = cache.get(method)
+        if handle is None:
+            handle = cache[method] = getattr(proxy, method)
+        return handle
+
+    # Long-polls park server-side for tens of seconds; keep them off the
+    # pooled binary sockets so they never hold one hostage
+    _LONG_POLL_METHODS = frozenset({"wait_for_change"})
+
+    def _call_backend(self, backend: str, method: str, params: tuple):
+        """Run an RPC on a backend, preferring the binary fast path"""
+        if (msgpack is not None and method not in self._LONG_POLL_METHODS
+                and self._binary_ok.get(backend, True)):
+            try:
+                return self._binary_call(backend, method, params)
+            except ConnectionRefusedError:
+                # No binary listener on this backend; pin it to XML-RPC
+                self._binary_ok[backend] = False
+            except _FastPathUnavailable:
+                # The request never reached the backend; re-issuing over
+                # XML-RPC cannot double-execute it. Response-phase errors
+                # propagate instead — a duplicated cheating call would
+                # escalate a warning straight to termination.
+                pass
+        pool = self._proxy_pool.get(backend)
+        if pool is None:
+            # Backend removed while in flight; fall back to a one-shot proxy
+            proxy = xmlrpc.client.ServerProxy(backend, allow_none=True)
+            return getattr(proxy, method)(*params)
+        try:
+            proxy = pool.get_nowait()
+        except queue.Empty:
+            proxy = xmlrpc.client.ServerProxy(
+                backend, allow_none=True, transport=KeepAliveTransport()
+            )
+        try:
+            return self._method_handle(proxy, method)(*params)
+        finally:
+            try:
+                pool.put_nowait(proxy)
+            except queue.Full:
+                proxy("close")()
+
     def _is_backend_healthy(self, backend: str) -> bool:
         """Check if a backend is healthy"""
         try:
-            proxy = xmlrpc.client.ServerProxy(backend, allow_none=True)
+            proxy = self._probe_proxies.get(backend)
+            if proxy is None:
+                proxy = self._probe_proxies[backend] = xmlrpc.client.ServerProxy(
+                    backend, allow_none=True,
+                    transport=KeepAliveTransport(timeout=self.health_check_timeout)
+                )
             # Simple health check - try to get status
             result = proxy.get_status()
             return result.get("success", False)
         except Exception as e:
             logger.warning(f"Health check failed for {backend}: {e}")
+            # Drop the probe proxy so the next round reconnects cleanly
+            self._probe_proxies.pop(backend, None)
             return False
     
+    def stop(self):
+        """Signal background workers to exit"""
+        self._stop.set()
+
     def _health_check_worker(self):
         """Background health check worker"""
-        while True:
+        while not self._stop.is_set():
             try:
+                now = time.monotonic()
+                with self.lock:
+                    backends = list(self.backends)
+
+                to_probe = []
+                for backend in backends:
+                    if self._next_probe.get(backend, 0.0) > now:
+                        continue  # not due yet
+                    interval = self._probe_interval.get(
+                        backend, self.health_check_min_interval
+                    )
+                    last_ok = self._last_ok_dispatch.get(backend)
+                    if (last_ok is not None and now - last_ok < interval
+                            and self.backend_status.get(backend, False)):
+                        # A recent successful dispatch is an implicit probe
+                        self._schedule_probe(backend, healthy=True, now=now)
+                        continue
+                    to_probe.append(backend)
+
+                # Probe without holding self.lock so dispatches never stall
+                # behind a slow health round
+                results = {}
+                futures = {
+                    self._health_executor.submit(self._is_backend_healthy, b): b
+                    for b in to_probe
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
                 with self.lock:
-                    for backend in self.backends:
-                        is_healthy = self._is_backend_healthy(backend)
-                        self.backend_status[backend] = is_healthy
-                        
-                        if is_healthy:
-                            logger.debug(f"Backend {backend} is healthy")
-                        else:
-                            logger.warning(f"Backend {backend} is unhealthy")
-                
-                time.sleep(self.health_check_interval)
+                    for backend, is_healthy in results.items():
+                        if backend not in self.backend_status:
+                            continue  # removed while the probe was in flight
+                        # Requeues the heap entry itself on recovery
+                        self._set_backend_health(backend, is_healthy)
+
+                now = time.monotonic()
+                for backend, is_healthy in results.items():
+                    self._schedule_probe(backend, healthy=is_healthy, now=now)
+                    if is_healthy:
+                        logger.debug(f"Backend {backend} is healthy")
+                    else:
+                        logger.warning(f"Backend {backend} is unhealthy")
+
+                next_due = min(
+                    (self._next_probe.get(b, 0.0) for b in backends),
+                    default=now + self.health_check_min_interval
+                )
+                # Event wait instead of sleep: no drift against the probe
+                # deadlines and an immediate wake-up on shutdown
+                delay = min(max(next_due - time.monotonic(), 0.2),
+                            self.health_check_max_interval)
+                if self._stop.wait(delay):
+                    break
             except Exception as e:
                 logger.error(f"Health check worker error: {e}")
-                time.sleep(5)
+                if self._stop.wait(5):
+                    break
+
+    def _schedule_probe(self, backend: str, healthy: bool, now: float):
+        """Back off probing while healthy, re-check aggressively on failure"""
+        if healthy:
+            interval = min(
+                self._probe_interval.get(backend, self.health_check_min_interval) * 2,
+                self.health_check_max_interval
+            )
+        else:
+            interval = self.health_check_failure_interval
+        self._probe_interval[backend] = interval
+        self._next_probe[backend] = now + interval
     
+    @property
+    def request_count(self) -> Dict[str, int]:
+        """Per-backend request totals as a dict view over the counter array"""
+        return {backend: self._reqcnt[i] for backend, i in self._idx.items()}
+
+    @property
+    def inflight(self) -> Dict[str, int]:
+        """Per-backend in-flight counts as a dict view over the counter array"""
+        return {backend: self._inflight[i] for backend, i in self._idx.items()}
+
+    def _set_backend_health(self, backend: str, healthy: bool):
+        """Update status dict and healthy list together (caller holds lock)"""
+        was_healthy = self.backend_status.get(backend, False)
+        self.backend_status[backend] = healthy
+        if healthy:
+            if backend not in self._healthy:
+                self._healthy.append(backend)
+            if not was_healthy:
+                # The heap entry was lazily discarded while unhealthy; push
+                # a fresh one or the backend is never selected again
+                with self._select_lock:
+                    self._requeue_backend(backend)
+        elif backend in self._healthy:
+            self._healthy.remove(backend)
+
+    def _requeue_backend(self, backend: str):
+        """Push a fresh heap entry for a backend (caller holds _select_lock)"""
+        i = self._idx.get(backend)
+        if i is None:
+            return
+        version = self._heap_version.get(backend, 0) + 1
+        self._heap_version[backend] = version
+        heapq.heappush(self._heap, (
+            self._inflight[i], self._reqcnt[i], backend, version
+        ))
+
+    def _pop_healthy_backend(self) -> Optional[str]:
+        """Pop the least-loaded healthy backend (caller holds _select_lock)"""
+        while self._heap:
+            _, _, backend, version = heapq.heappop(self._heap)
+            if version != self._heap_version.get(backend):
+                continue  # stale entry, superseded by a newer push
+            if not self.backend_status.get(backend, False):
+                continue  # skipped; _requeue_backend re-adds it on recovery
+            return backend
+        return None
+
     def _get_next_backend(self) -> Optional[str]:
         """Select healthy backend with least in-flight requests"""
-        with self.lock:
-            healthy_backends = [b for b in self.backends if self.backend_status.get(b, False)]
-            if not healthy_backends:
-                logger.error("No healthy backends available!")
-                return self.backends[0] if self.backends else None
-
-            # Choose backend with minimal in-flight; tie-breaker: lowest total request_count
+        if len(self._healthy) > self.p2c_threshold:
+            # Power-of-two-choices: sample two and take the less loaded one.
+            # Near-optimal distribution without scanning the whole pool.
+            candidates = random.sample(list(self._healthy), 2)
             backend = min(
-                healthy_backends,
-                key=lambda b: (self.inflight.get(b, 0), self.request_count.get(b, 0), b)
+                candidates,
+                key=lambda b: (self._inflight[self._idx[b]], self._reqcnt[self._idx[b]], b)
             )
-            self.request_count[backend] += 1
-            self.inflight[backend] += 1
+            i = self._idx[backend]
+            with self._select_lock:
+                self._inflight[i] += 1
+                self._requeue_backend(backend)
+            self._reqcnt[i] = self._rc_next[i]()
             return backend
+
+        with self._select_lock:
+            backend = self._pop_healthy_backend()
+            if backend is None:
+                # Heap drained (e.g. after recoveries); rebuild from healthy set
+                for b in self.backends:
+                    if self.backend_status.get(b, False):
+                        if b not in self._healthy:
+                            self._healthy.append(b)
+                        self._requeue_backend(b)
+                backend = self._pop_healthy_backend()
+            if backend is None:
+                logger.error("No healthy backends available!")
+                return self.backends[0] if self.backends else None
+
+            i = self._idx[backend]
+            self._inflight[i] += 1
+            self._requeue_backend(backend)
+        self._reqcnt[i] = self._rc_next[i]()
+        return backend
+
+    def _release_backend(self, backend: str):
+        """Decrement in-flight count after a request finishes"""
+        with self._select_lock:
+            i = self._idx.get(backend)
+            if i is not None and self._inflight[i] > 0:
+                self._inflight[i] -= 1
+            if backend in self._heap_version and self.backend_status.get(backend, False):
+                self._requeue_backend(backend)
     
     def _dispatch(self, method: str, params: tuple) -> any:
         """Dispatch request to appropriate backend"""
@@ -90,67 +542,186 @@ class LoadBalancer:
         
         if not backend:
             raise Exception("No backends available")
-        
+
         try:
-            proxy = xmlrpc.client.ServerProxy(backend, allow_none=True)
-            func = getattr(proxy, method)
-            result = func(*params)
-            
+            result = self._call_backend(backend, method, params)
+
+            # Implicit liveness signal: lets the health worker skip a probe
+            self._last_ok_dispatch[backend] = time.monotonic()
             logger.debug(f"Request {method} dispatched to {backend}")
             return result
-            
+
         except Exception as e:
             logger.error(f"Backend {backend} failed for method {method}: {e}")
-            
-            # Mark backend as unhealthy and retry with next one
+
+            # Take the failed backend out of rotation before picking the
+            # retry target; otherwise the pick can land on it again and
+            # its in-flight increment is never released
             with self.lock:
-                self.backend_status[backend] = False
-                # Decrement inflight for failed backend
-                if backend in self.inflight and self.inflight[backend] > 0:
-                    self.inflight[backend] -= 1
+                self._set_backend_health(backend, False)
 
             # Try next backend
             next_backend = self._get_next_backend()
             if next_backend and next_backend != backend:
                 try:
-                    proxy = xmlrpc.client.ServerProxy(next_backend, allow_none=True)
-                    func = getattr(proxy, method)
-                    result = func(*params)
+                    result = self._call_backend(next_backend, method, params)
                     logger.info(f"Request {method} retried on {next_backend}")
                     return result
                 except Exception as retry_e:
                     logger.error(f"Retry also failed on {next_backend}: {retry_e}")
-            
+                finally:
+                    self._release_backend(next_backend)
+
             raise Exception(f"All backends failed for method {method}: {e}")
         finally:
-            # Always decrement inflight for the chosen backend
-            with self.lock:
-                if backend in self.inflight and self.inflight[backend] > 0:
-                    self.inflight[backend] -= 1
+            # Single decrement per pick, success or failure
+            self._release_backend(backend)
 
     # Public RPC method to allow generic forwarding from clients
     def invoke(self, method: str, *params):
         """Invoke a backend RPC by method name with params"""
-        return self._dispatch(method, params)
+        ttl = self.read_rpc_ttl.get(method)
+        if not ttl:
+            return self._dispatch(method, params)
+        try:
+            key = (method, params)
+            hash(key)
+        except TypeError:
+            return self._dispatch(method, params)
+        now = time.monotonic()
+        with self._rcache_lock:
+            entry = self._rcache.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+        return self._single_flight(key, method, params)
+
+    def _single_flight(self, key: tuple, method: str, params: tuple):
+        """Coalesce concurrent identical read RPCs into one backend call"""
+        with self._sf_lock:
+            fut = self._inflight_calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight_calls[key] = Future()
+        if not leader:
+            # Another thread is already fetching this; share its result
+            return fut.result()
+        try:
+            result = self._dispatch(method, params)
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            with self._rcache_lock:
+                self._rcache[key] = (time.monotonic(), result)
+            fut.set_result(result)
+            return result
+        finally:
+            with self._sf_lock:
+                self._inflight_calls.pop(key, None)
     
+    def _multicall_backend(self, backend: str, items: List[tuple]) -> List:
+        """Run a group of (index, method, params) calls as one MultiCall"""
+        pool = self._proxy_pool.get(backend)
+        proxy = None
+        if pool is not None:
+            try:
+                proxy = pool.get_nowait()
+            except queue.Empty:
+                pass
+        if proxy is None:
+            proxy = xmlrpc.client.ServerProxy(
+                backend, allow_none=True, transport=KeepAliveTransport()
+            )
+        try:
+            multicall = xmlrpc.client.MultiCall(proxy)
+            for _, method, params in items:
+                getattr(multicall, method)(*params)
+            batch = multicall()
+            out = []
+            for j in range(len(items)):
+                try:
+                    out.append(batch[j])
+                except xmlrpc.client.Fault as fault:
+                    out.append({"success": False, "error": str(fault)})
+            return out
+        finally:
+            if pool is not None:
+                try:
+                    pool.put_nowait(proxy)
+                except queue.Full:
+                    proxy("close")()
+
+    def multi_invoke(self, calls: List) -> List:
+        """Execute a batch of [method, params] calls in one request
+
+        Calls are spread across backends by the usual least-connections
+        pick, then issued as one system.multicall per backend, so a batch
+        of N calls costs one round-trip per involved backend instead of N.
+        Per-call faults come back as {"success": False, "error": ...} in
+        the original order.
+        """
+        results = [None] * len(calls)
+        grouped: Dict[str, List[tuple]] = {}
+        for i, call in enumerate(calls):
+            method, params = call[0], tuple(call[1])
+            backend = self._get_next_backend()
+            if backend is None:
+                raise Exception("No backends available")
+            grouped.setdefault(backend, []).append((i, method, params))
+
+        for backend, items in grouped.items():
+            try:
+                batch = self._multicall_backend(backend, items)
+                for (idx, _, _), value in zip(items, batch):
+                    results[idx] = value
+            except Exception as e:
+                logger.error(f"Multicall failed on {backend}: {e}")
+                with self.lock:
+                    self._set_backend_health(backend, False)
+                for idx, _, _ in items:
+                    results[idx] = {"success": False, "error": str(e)}
+            finally:
+                for _ in items:
+                    self._release_backend(backend)
+        return results
+
     def get_stats(self) -> Dict:
         """Get load balancer statistics"""
+        # Snapshot references under the lock, copy outside it so stats
+        # polling never extends the dispatch critical section
         with self.lock:
-            return {
-                "backends": self.backends,
-                "backend_status": self.backend_status.copy(),
-                "request_count": self.request_count.copy(),
-                "total_requests": sum(self.request_count.values())
-            }
+            backends = list(self.backends)
+            status_ref = self.backend_status
+        while True:
+            try:
+                backend_status = dict(status_ref)
+                break
+            except RuntimeError:
+                continue  # backend added/removed mid-copy; retry
+        request_count = self.request_count
+        return {
+            "backends": backends,
+            "backend_status": backend_status,
+            "request_count": request_count,
+            "total_requests": sum(request_count.values())
+        }
     
     def add_backend(self, backend: str):
         """Add a new backend to the pool"""
+        backend = sys.intern(backend)
         with self.lock:
             if backend not in self.backends:
                 self.backends.append(backend)
-                self.backend_status[backend] = True
-                self.request_count[backend] = 0
-                self.inflight[backend] = 0
+                self._set_backend_health(backend, True)
+                self._idx[backend] = len(self._inflight)
+                self._inflight.append(0)
+                self._reqcnt.append(0)
+                self._rc_next.append(itertools.count(1).__next__)
+                self._probe_interval[backend] = self.health_check_min_interval
+                self._next_probe[backend] = 0.0
+                self._init_proxy_pool(backend)
+                with self._select_lock:
+                    self._requeue_backend(backend)
                 logger.info(f"Added backend: {backend}")
     
     def remove_backend(self, backend: str):
@@ -159,8 +730,24 @@ class LoadBalancer:
             if backend in self.backends:
                 self.backends.remove(backend)
                 self.backend_status.pop(backend, None)
-                self.request_count.pop(backend, None)
-                self.inflight.pop(backend, None)
+                if backend in self._healthy:
+                    self._healthy.remove(backend)
+                # Rebuild the index and counter arrays without this backend
+                counts = {b: (self._inflight[i], self._reqcnt[i])
+                          for b, i in self._idx.items() if b != backend}
+                self._idx = {b: i for i, b in enumerate(self.backends)}
+                self._inflight = array('i', (counts[b][0] for b in self.backends))
+                self._reqcnt = array('q', (counts[b][1] for b in self.backends))
+                self._rc_next = [itertools.count(counts[b][1] + 1).__next__
+                                 for b in self.backends]
+                self._drain_proxy_pool(backend)
+                self._probe_proxies.pop(backend, None)
+                self._probe_interval.pop(backend, None)
+                self._next_probe.pop(backend, None)
+                self._last_ok_dispatch.pop(backend, None)
+                with self._select_lock:
+                    # Invalidate any live heap entry for this backend
+                    self._heap_version.pop(backend, None)
                 logger.info(f"Removed backend: {backend}")
 
 def create_load_balancer(backends: List[str], port: int = 9000):
@@ -172,8 +759,9 @@ def create_load_balancer(backends: List[str], port: int = 9000):
     health_thread.start()
     
     # Create XML-RPC server
-    server = SimpleXMLRPCServer(("0.0.0.0", port), allow_none=True)
+    server = ThreadedXMLRPCServer(("0.0.0.0", port), allow_none=True)
     server.register_introspection_functions()
+    server.register_multicall_functions()  # Batched sub-calls forward via _dispatch
     server.register_instance(balancer)
     
     # Register additional utility methods
@@ -181,6 +769,7 @@ def create_load_balancer(backends: List[str], port: int = 9000):
     server.register_function(balancer.add_backend, "add_backend")
     server.register_function(balancer.remove_backend, "remove_backend")
     server.register_function(balancer.invoke, "invoke")
+    server.register_function(balancer.multi_invoke, "multi_invoke")
     
     logger.info(f"Load balancer starting on port {port}")
     return server, balancer
@@ -214,5 +803,6 @@ if __name__ == "__main__":
         server.serve_forever()
     except KeyboardInterrupt:
         logger.info("Load balancer shutting down...")
+        balancer.stop()
         server.shutdown()
 
@@ -4,27 +4,218 @@ Online Exam Proctoring System - Main Coordinator Server
 Implements XML-RPC server with cheating detection, time sync, and mutual exclusion
 """
 
+import re
 import time
+import heapq
+import itertools
+import queue
 import threading
 import json
 import logging
+import hashlib
+import socket
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, List, Optional, Tuple
 from xmlrpc.server import SimpleXMLRPCServer
 from xmlrpc.client import ServerProxy
 import xmlrpc.client
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('exam_system.log'),
-        logging.StreamHandler()
-    ]
-)
+try:
+    import msgpack
+except ImportError:
+    # Binary RPC listener is optional; XML-RPC remains the wire format
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    # Faster JSON encoding for the event log; stdlib json works fine too
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    # Vectorized Berkeley-sync math; the pure-Python fallback is fine
+    np = None
+
+def _dumps(data: Dict) -> str:
+    """Encode event data as JSON with the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+# Binary RPC listener sits at the XML-RPC port plus this offset (must match
+# the load balancer; clear of the balancer's 9000 range and the autosave
+# channel at port + 2000)
+BINARY_RPC_PORT_OFFSET = 3000
+
+# Read-only HTTP GET endpoints (questions/timer with ETag revalidation) sit
+# at the XML-RPC port plus this offset
+HTTP_GET_PORT_OFFSET = 4000
+
+# Shared no-op/error responses. Handlers return these exact objects (never
+# copies) so the dispatcher can replay pre-marshaled XML by identity instead
+# of re-marshaling an identical fresh dict on every call.
+INVALID_ROLL = {"success": False, "message": "Invalid roll number"}
+ALREADY_REGISTERED = {"success": False, "message": "Student already registered"}
+EXAM_ALREADY_STARTED = {"success": False, "message": "Exam already started"}
+EXAM_NOT_STARTED = {"success": False, "message": "Exam not started"}
+NO_STUDENTS = {"success": False, "message": "No students registered"}
+ALREADY_SUBMITTED = {"success": False, "message": "Student already submitted or terminated"}
+FINAL_RECORDED = {"success": False, "reason": "finalized", "message": "Final submission already recorded"}
+ALREADY_REPLIED = {"success": False, "message": "Already replied"}
+NOT_CS_HOLDER = {"success": False, "message": "Not the current holder"}
+
+_PREMARSHALED_WIRE = {
+    id(_resp): xmlrpc.client.dumps((_resp,), methodresponse=True).encode("utf-8")
+    for _resp in (
+        INVALID_ROLL, ALREADY_REGISTERED, EXAM_ALREADY_STARTED, EXAM_NOT_STARTED,
+        NO_STUDENTS, ALREADY_SUBMITTED, FINAL_RECORDED, ALREADY_REPLIED, NOT_CS_HOLDER,
+    )
+}
+
+# Configure logging: handlers sit behind a queue so emitting a record never
+# blocks an RPC handler on file or console I/O
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('exam_system.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_queue_handler = QueueHandler(_log_queue)
+# Message-only formatter: prepare() bakes this into record.msg, so the
+# listener's handlers apply the full format exactly once
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
+class PooledXMLRPCServer(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    """XML-RPC server that handles requests concurrently on a fixed pool
+
+    SimpleXMLRPCServer serves one request at a time, so under concurrent
+    student load every register/submit/report call queues behind the
+    previous one. Requests are dispatched to a bounded worker pool rather
+    than a fresh thread per connection.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    pool_size = 64
+    # Deep accept backlog so a burst of student polls queues in the kernel
+    # instead of getting connection resets while workers are busy.
+    request_queue_size = 128
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._request_pool = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="rpc-worker"
+        )
+
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        super().server_bind()
+
+    def get_request(self):
+        request, client_address = super().get_request()
+        # Short request/response exchanges; don't let Nagle delay replies.
+        try:
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        return request, client_address
+
+    def process_request(self, request, client_address):
+        self._request_pool.submit(
+            self.process_request_thread, request, client_address
+        )
+
+    def server_close(self):
+        super().server_close()
+        self._request_pool.shutdown(wait=False)
+
+    def _marshaled_dispatch(self, data, dispatch_method=None, path=None):
+        # Same flow as SimpleXMLRPCDispatcher, plus an identity fast path:
+        # handlers that return one of the shared constant responses skip
+        # marshaling entirely and replay the cached XML bytes.
+        try:
+            params, method = xmlrpc.client.loads(
+                data, use_builtin_types=self.use_builtin_types
+            )
+            if dispatch_method is not None:
+                response = dispatch_method(method, params)
+            else:
+                response = self._dispatch(method, params)
+            wire = _PREMARSHALED_WIRE.get(id(response))
+            if wire is not None:
+                return wire
+            response = xmlrpc.client.dumps(
+                (response,), methodresponse=1,
+                allow_none=self.allow_none, encoding=self.encoding,
+            )
+        except xmlrpc.client.Fault as fault:
+            response = xmlrpc.client.dumps(
+                fault, allow_none=self.allow_none, encoding=self.encoding
+            )
+        except BaseException as exc:
+            response = xmlrpc.client.dumps(
+                xmlrpc.client.Fault(1, "%s:%s" % (type(exc), exc)),
+                encoding=self.encoding, allow_none=self.allow_none,
+            )
+        return response.encode(self.encoding, 'xmlcharrefreplace')
+
+class CachingXMLRPCServer(PooledXMLRPCServer):
+    """XML-RPC server that replays pre-marshaled responses for static methods
+
+    Responses to methods whose output is constant for the exam (the question
+    bank) are cached as marshaled XML bytes keyed by the raw request, so
+    repeated calls skip both dispatch and re-marshalling.
+    """
+
+    cacheable_methods = ("get_questions", "get_questions_etag")
+
+    _method_re = re.compile(rb"<methodName>\s*([^<]+?)\s*</methodName>")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_responses = {}
+
+    def invalidate_response_cache(self):
+        """Drop cached responses (called when exam state changes)"""
+        self._cached_responses.clear()
+
+    def _marshaled_dispatch(self, data, dispatch_method=None, path=None):
+        match = self._method_re.search(data)
+        if match and match.group(1).decode(errors="replace") in self.cacheable_methods:
+            cached = self._cached_responses.get(data)
+            if cached is None:
+                cached = super()._marshaled_dispatch(data, dispatch_method, path)
+                self._cached_responses[data] = cached
+            return cached
+        return super()._marshaled_dispatch(data, dispatch_method, path)
+
+class AnswerMeta:
+    """Per-answer write metadata stored as a slotted object
+
+    Thousands of answers accumulate over an exam; a slotted instance is
+    markedly smaller than the dict literal it replaces and attribute access
+    is faster on the hot last-writer-wins comparison path.
+    """
+    __slots__ = ("value", "version", "lamport_ts", "last_write_mode")
+
+    def __init__(self, value=None, version=0, lamport_ts=-1, last_write_mode=None):
+        self.value = value
+        self.version = version
+        self.lamport_ts = lamport_ts
+        self.last_write_mode = last_write_mode
+
 class ExamCoordinator:
     """Main coordinator for the exam proctoring system"""
     
@@ -35,12 +226,16 @@ class ExamCoordinator:
         self.exam_started = False
         self.exam_ended = False
         self.lamport_clock = 0
+        self._local_clock = itertools.count(1)  # Lock-free ticks for local events
         self.cs_holder = None  # Who currently holds the critical section
-        self.cs_queue = []  # Queue for Ricart-Agrawala requests
+        self.cs_queue = []  # Min-heap of (timestamp, roll, request) entries
+        self._queue_rolls = set()  # Rolls with a live queued request
         self.received_replies = set()  # Track received replies for RA
         self.pending_requests = {}  # Track pending CS requests
         self.replicas = []  # List of replica servers for replication
-        self.version_counter = 0  # For replication consistency
+        # For replication consistency; itertools.count is atomic under the
+        # GIL, so independent writers never synchronize on it
+        self._version_counter = itertools.count(1)
         
         # Exam questions and storage (in-memory abstraction)
         self.questions: List[Dict] = [
@@ -50,56 +245,131 @@ class ExamCoordinator:
         ]
         self.exam_duration_seconds = 300
         self.exam_start_monotonic: Optional[float] = None
+
+        # Questions are static for the exam; cache the sanitized payload and
+        # an ETag so clients can revalidate without re-fetching the body
+        self._questions_cache = [
+            {"id": q["id"], "text": q["text"], "options": q["options"]} for q in self.questions
+        ]
+        self._questions_etag = hashlib.sha1(
+            json.dumps(self._questions_cache, sort_keys=True).encode()).hexdigest()
+        self._questions_response = {
+            "success": True,
+            "questions": self._questions_cache,
+            "etag": self._questions_etag
+        }
         
         # Answer storage with versioning for eventual consistency
-        # answers[roll][question_id] = { value, version, lamport_ts, last_write_mode }
-        self.answers: Dict[str, Dict[int, Dict]] = {}
+        # answers[roll][question_id] = AnswerMeta(value, version, lamport_ts,
+        # last_write_mode); writes are serialized per roll by the stripe locks
+        self.answers: Dict[str, Dict[int, AnswerMeta]] = {}
         self.final_submissions: Dict[str, Dict] = {}
-        
-        # Locks to avoid deadlock between autosave and final submit
-        self.answers_lock = threading.Lock()
+
+        # Lock to avoid deadlock between autosave and final submit
         self.submit_lock = threading.Lock()
+        self._submissions_in_progress = set()  # Rolls with a submit in flight
         
         # Berkeley time sync
         self.time_sync_data = {}
         self.last_sync_time = 0
+        # Wakes the sync worker when quorum is reached or the exam ends
+        self._sync_cv = threading.Condition()
         
         # Thread locks
         self.lock = threading.Lock()
         self.cs_lock = threading.Lock()
-        
+
+        # Striped per-student locks: operations on different students run
+        # in parallel; self.lock stays for structural changes (registration,
+        # exam start/end) and whole-table reads
+        self._stripes = [threading.Lock() for _ in range(64)]
+
+        # State change notification for long-polling clients
+        self.state_version = 0
+        self.state_cv = threading.Condition()
+
+        # Set by create_server so exam transitions can drop cached responses
+        self.rpc_server = None
+
+        # Audit-log lines are queued and flushed in batches by a writer
+        # thread, keeping the append syscall off the RPC handler path
+        self._log_q: "queue.Queue[str]" = queue.Queue()
+        self._log_writer_thread = threading.Thread(
+            target=self._log_writer, daemon=True)
+        self._log_writer_thread.start()
+
         logger.info(f"Exam Coordinator {replica_id} initialized on port {port}")
     
+    def _log_writer(self):
+        """Drain queued audit lines into common.txt in batches"""
+        with open("common.txt", "a", buffering=1 << 16) as f:
+            while True:
+                batch = [self._log_q.get()]
+                try:
+                    while len(batch) < 256:
+                        batch.append(self._log_q.get_nowait())
+                except queue.Empty:
+                    pass
+                f.write("".join(batch))
+                f.flush()
+
+    def _slock(self, roll: str) -> threading.Lock:
+        """Return the lock stripe guarding one student's record"""
+        return self._stripes[hash(roll) & 63]
+
+    def _mutate_student(self, roll: str, **fields) -> Dict:
+        """Replace a student's record with an updated copy (caller holds stripe)
+
+        Records are copy-on-write: status readers hand out references
+        instead of per-entry copies, so entries are rebound, never
+        mutated in place.
+        """
+        updated = {**self.students[roll], **fields}
+        self.students[roll] = updated
+        return updated
+
     def _increment_lamport_clock(self, received_timestamp: int = None) -> int:
         """Increment and return Lamport clock value"""
+        if received_timestamp is None:
+            # Local events dominate and never need a merge: draw from a
+            # GIL-atomic counter instead of serializing on self.lock.
+            value = next(self._local_clock)
+            if value > self.lamport_clock:
+                self.lamport_clock = value
+            return value
+        # Merging a received timestamp still takes the lock, and reseeds
+        # the local counter so later lock-free ticks stay monotonic.
         with self.lock:
-            if received_timestamp is not None:
-                self.lamport_clock = max(self.lamport_clock, received_timestamp) + 1
-            else:
-                self.lamport_clock += 1
-            return self.lamport_clock
+            value = max(self.lamport_clock, received_timestamp) + 1
+            self.lamport_clock = value
+            self._local_clock = itertools.count(value + 1)
+            return value
     
     def _log_event(self, event: str, data: Dict = None):
         """Log system events with timestamp"""
-        timestamp = datetime.now().isoformat()
-        log_entry = {
-            "timestamp": timestamp,
-            "replica_id": self.replica_id,
-            "event": event,
-            "data": data or {}
-        }
-        logger.info(f"EVENT: {event} - {json.dumps(data)}")
-        
-        # Write to common log file
-        with open("common.txt", "a") as f:
-            f.write(f"{timestamp} [{self.replica_id}] {event}: {json.dumps(data)}\n")
+        # Hot path for every RPC: raw epoch timestamp instead of a datetime
+        # object + isoformat, and the data encoded exactly once
+        timestamp = time.time()
+        data_s = _dumps(data) if data else "{}"
+        logger.info("EVENT: %s - %s", event, data_s)
+
+        # Queue for the common log file; the writer thread owns the syscall
+        self._log_q.put_nowait(
+            f"{timestamp:.6f} [{self.replica_id}] {event}: {data_s}\n")
+
+        # Every logged event is a state change; wake any long-polling clients
+        with self.state_cv:
+            self.state_version += 1
+            self.state_cv.notify_all()
     
     def register_student(self, roll: str) -> Dict:
         """Register a new student for the exam"""
         try:
+            if not roll:
+                return INVALID_ROLL
             with self.lock:
                 if roll in self.students:
-                    return {"success": False, "message": "Student already registered"}
+                    return ALREADY_REGISTERED
                 
                 self.students[roll] = {
                     "status": "not_started",
@@ -122,24 +392,36 @@ class ExamCoordinator:
         try:
             with self.lock:
                 if self.exam_started:
-                    return {"success": False, "message": "Exam already started"}
-                
+                    return EXAM_ALREADY_STARTED
+
                 if not self.students:
-                    return {"success": False, "message": "No students registered"}
-                
-                # Update all students to in_progress
-                for roll in self.students:
-                    self.students[roll]["status"] = "in_progress"
-                    self.students[roll]["last_activity"] = time.time()
-                
+                    return NO_STUDENTS
+
                 self.exam_started = True
                 self.exam_start_monotonic = time.monotonic()
-                self._log_event("exam_started", {"student_count": len(self.students)})
-                
-                # Start Berkeley time sync
-                self._start_berkeley_sync()
-                
-                return {"success": True, "message": "Exam started successfully"}
+                rolls = list(self.students)
+
+            # Update all students to in_progress under their stripes, so a
+            # concurrent cheating/submit mutation is not overwritten
+            # wholesale by the copy-on-write rebind. Stripes nest outside
+            # self.lock here because answer writes take self.lock (Lamport
+            # merge) while holding a stripe — nesting the other way would
+            # deadlock.
+            for roll in rolls:
+                with self._slock(roll):
+                    if roll in self.students:
+                        self._mutate_student(
+                            roll, status="in_progress", last_activity=time.time())
+
+            self._log_event("exam_started", {"student_count": len(rolls)})
+
+            if self.rpc_server is not None:
+                self.rpc_server.invalidate_response_cache()
+
+            # Start Berkeley time sync
+            self._start_berkeley_sync()
+
+            return {"success": True, "message": "Exam started successfully"}
                 
         except Exception as e:
             logger.error(f"Error starting exam: {e}")
@@ -148,10 +430,10 @@ class ExamCoordinator:
     def cheating(self, roll: str, evidence: str) -> Dict:
         """Handle cheating detection for a student"""
         try:
-            with self.lock:
+            with self._slock(roll):
                 if roll not in self.students:
-                    return {"success": False, "message": "Invalid roll number"}
-                
+                    return INVALID_ROLL
+
                 student = self.students[roll]
                 warnings = student["warnings"]
                 marks = student["marks"]
@@ -165,25 +447,31 @@ class ExamCoordinator:
                 
                 if warnings == 0:
                     # First offense
-                    student["warnings"] = 1
-                    student["marks"] = marks * 0.5  # Deduct 50%
-                    student["status"] = "warned"
-                    student["last_activity"] = time.time()
-                    
+                    student = self._mutate_student(
+                        roll,
+                        warnings=1,
+                        marks=marks * 0.5,  # Deduct 50%
+                        status="warned",
+                        last_activity=time.time()
+                    )
+
                     return {
                         "success": True,
                         "action": "warning",
                         "new_marks": student["marks"],
                         "message": f"First warning for {roll}. Marks reduced to {student['marks']:.1f}"
                     }
-                
+
                 elif warnings >= 1:
                     # Second offense - terminate
-                    student["warnings"] = 2
-                    student["marks"] = 0.0
-                    student["status"] = "terminated"
-                    student["last_activity"] = time.time()
-                    
+                    student = self._mutate_student(
+                        roll,
+                        warnings=2,
+                        marks=0.0,
+                        status="terminated",
+                        last_activity=time.time()
+                    )
+
                     return {
                         "success": True,
                         "action": "terminated",
@@ -199,56 +487,57 @@ class ExamCoordinator:
     def submit_exam(self, roll: str, mode: str) -> Dict:
         """Handle exam submission (manual or auto)"""
         try:
-            # Prevent deadlock: acquire submit_lock first, then main lock
-            with self.submit_lock, self.lock:
+            # Prevent deadlock: acquire submit_lock first, then student stripe
+            with self.submit_lock, self._slock(roll):
                 if roll not in self.students:
-                    return {"success": False, "message": "Invalid roll number"}
+                    return INVALID_ROLL
                 
                 student = self.students[roll]
                 if student["status"] in ["terminated", "submitted"]:
-                    return {"success": False, "message": "Student already submitted or terminated"}
+                    return ALREADY_SUBMITTED
                 
                 # Check for conflicts with simultaneous submissions
-                conflict_key = f"submit_{roll}"
                 current_time = self._increment_lamport_clock()
-                
-                # Use atomic compare-and-set for conflict resolution
-                if hasattr(self, '_submission_locks'):
-                    if conflict_key in self._submission_locks:
-                        return {
-                            "success": False,
-                            "reason": "conflict_resolved",
-                            "winner": roll,
-                            "message": "Submission already in progress"
-                        }
-                    self._submission_locks[conflict_key] = current_time
-                else:
-                    self._submission_locks = {conflict_key: current_time}
-                
-                # Mark final submission snapshot (for conflict resolution with autosave)
-                self.final_submissions[roll] = {
-                    "lamport_ts": current_time,
-                    "mode": mode,
-                    "version": self.version_counter + 1
-                }
 
-                student["status"] = "submitted"
-                student["last_activity"] = time.time()
-                student["submission_mode"] = mode
-                student["submission_time"] = current_time
-                
-                self._log_event("exam_submitted", {
-                    "roll": roll, 
-                    "mode": mode, 
-                    "timestamp": current_time,
-                    "final_marks": student["marks"]
-                })
-                
-                return {
-                    "success": True,
-                    "message": f"Exam submitted successfully via {mode} mode",
-                    "final_marks": student["marks"]
-                }
+                if roll in self._submissions_in_progress:
+                    return {
+                        "success": False,
+                        "reason": "conflict_resolved",
+                        "winner": roll,
+                        "message": "Submission already in progress"
+                    }
+                self._submissions_in_progress.add(roll)
+
+                try:
+                    # Mark final submission snapshot (for conflict resolution with autosave)
+                    self.final_submissions[roll] = {
+                        "lamport_ts": current_time,
+                        "mode": mode,
+                        "version": next(self._version_counter)
+                    }
+
+                    student = self._mutate_student(
+                        roll,
+                        status="submitted",
+                        last_activity=time.time(),
+                        submission_mode=mode,
+                        submission_time=current_time
+                    )
+
+                    self._log_event("exam_submitted", {
+                        "roll": roll,
+                        "mode": mode,
+                        "timestamp": current_time,
+                        "final_marks": student["marks"]
+                    })
+
+                    return {
+                        "success": True,
+                        "message": f"Exam submitted successfully via {mode} mode",
+                        "final_marks": student["marks"]
+                    }
+                finally:
+                    self._submissions_in_progress.discard(roll)
                 
         except Exception as e:
             logger.error(f"Error submitting exam for {roll}: {e}")
@@ -257,10 +546,10 @@ class ExamCoordinator:
     def report_time(self, roll: str, reported_time: float) -> Dict:
         """Report time for Berkeley synchronization"""
         try:
-            with self.lock:
+            with self._slock(roll):
                 if roll not in self.students:
-                    return {"success": False, "message": "Invalid roll number"}
-                
+                    return INVALID_ROLL
+
                 server_time = time.time()
                 offset = reported_time - server_time
                 
@@ -272,28 +561,79 @@ class ExamCoordinator:
                 }
                 
                 self._log_event("time_reported", {
-                    "roll": roll, 
+                    "roll": roll,
                     "reported_time": reported_time,
                     "offset": offset
                 })
-                
-                return {"success": True, "offset": offset}
-                
+
+                quorum_reached = len(self.time_sync_data) == 2
+
+            # Notify outside the stripe lock: the sync worker takes stripe
+            # locks while holding the condition, so nesting the other way
+            # around could deadlock
+            if quorum_reached:
+                with self._sync_cv:
+                    self._sync_cv.notify()
+            return {"success": True, "offset": offset}
+
         except Exception as e:
             logger.error(f"Error reporting time for {roll}: {e}")
             return {"success": False, "message": f"Time report failed: {str(e)}"}
     
+    def report_times_batch(self, reports: List) -> Dict:
+        """Report times for several students in one round-trip
+
+        Accepts a list of [roll, reported_time] pairs collected by a pair
+        leader, so Berkeley collection takes O(log N) RPC hops instead of
+        N-1 sequential reports that age while the later ones are gathered.
+        """
+        try:
+            with self.lock:
+                server_time = time.time()
+                offsets = {}
+                for roll, reported_time in reports:
+                    if roll not in self.students:
+                        continue
+                    offset = reported_time - server_time
+                    self.time_sync_data[roll] = {
+                        "reported_time": reported_time,
+                        "server_time": server_time,
+                        "offset": offset,
+                        "timestamp": time.time()
+                    }
+                    offsets[roll] = offset
+
+                self._log_event("times_reported_batch", {
+                    "rolls": list(offsets.keys()),
+                    "offsets": offsets
+                })
+
+                quorum_reached = len(self.time_sync_data) >= 2
+
+            if quorum_reached:
+                with self._sync_cv:
+                    self._sync_cv.notify()
+            return {"success": True, "offsets": offsets}
+
+        except Exception as e:
+            logger.error(f"Error reporting batched times: {e}")
+            return {"success": False, "message": f"Batched time report failed: {str(e)}"}
+
     def _start_berkeley_sync(self):
         """Start Berkeley time synchronization process"""
         def sync_worker():
-            while self.exam_started and not self.exam_ended:
-                try:
-                    if len(self.time_sync_data) >= 2:  # Need at least 2 participants
-                        self._perform_berkeley_sync()
-                    time.sleep(30)  # Sync every 30 seconds
-                except Exception as e:
-                    logger.error(f"Berkeley sync error: {e}")
-                    time.sleep(5)
+            # Condition wait instead of a fixed sleep: the worker syncs the
+            # moment quorum is reported, and exits promptly when end_exam
+            # notifies rather than dozing out the remainder of a 30s nap.
+            with self._sync_cv:
+                while self.exam_started and not self.exam_ended:
+                    try:
+                        if len(self.time_sync_data) >= 2:  # Need at least 2 participants
+                            self._perform_berkeley_sync()
+                        self._sync_cv.wait(timeout=30)  # Sync every 30 seconds
+                    except Exception as e:
+                        logger.error(f"Berkeley sync error: {e}")
+                        self._sync_cv.wait(timeout=5)
         
         sync_thread = threading.Thread(target=sync_worker, daemon=True)
         sync_thread.start()
@@ -302,97 +642,322 @@ class ExamCoordinator:
     def _perform_berkeley_sync(self):
         """Perform Berkeley time synchronization algorithm"""
         try:
-            # Calculate average offset
-            offsets = [data["offset"] for data in self.time_sync_data.values()]
-            avg_offset = sum(offsets) / len(offsets)
-            
+            rolls = list(self.time_sync_data.keys())
+            # Calculate average offset and per-student corrections; one
+            # vectorized mean/subtract when NumPy is available
+            if np is not None:
+                offsets = np.fromiter(
+                    (self.time_sync_data[roll]["offset"] for roll in rolls),
+                    dtype=np.float64, count=len(rolls),
+                )
+                avg_offset = float(offsets.mean())
+                corrections = (avg_offset - offsets).tolist()
+            else:
+                offsets = [self.time_sync_data[roll]["offset"] for roll in rolls]
+                avg_offset = sum(offsets) / len(offsets)
+                corrections = [avg_offset - offset for offset in offsets]
+
             # Send corrections to all students
-            for roll, data in self.time_sync_data.items():
-                correction = avg_offset - data["offset"]
-                self.students[roll]["clock_offset"] = correction
-                
-                self._log_event("time_correction_sent", {
-                    "roll": roll,
-                    "correction": correction,
-                    "avg_offset": avg_offset
-                })
-            
+            for roll, correction in zip(rolls, corrections):
+                with self._slock(roll):
+                    self._mutate_student(roll, clock_offset=correction)
+
+            # One batch event instead of a per-student entry keeps the audit
+            # log from growing by N lines every sync round
+            self._log_event("time_correction_batch", {
+                "avg_offset": avg_offset,
+                "corrections": dict(zip(rolls, corrections))
+            })
+
             self.last_sync_time = time.time()
             logger.info(f"Berkeley sync completed. Average offset: {avg_offset:.2f}s")
-            
+
         except Exception as e:
             logger.error(f"Berkeley sync calculation error: {e}")
     
     # ===================== Question and Answer RPC APIs =====================
     def get_questions(self) -> Dict:
         """Return list of questions without revealing correct answers"""
-        try:
-            with self.lock:
-                sanitized = [{"id": q["id"], "text": q["text"], "options": q["options"]} for q in self.questions]
-                return {"success": True, "questions": sanitized}
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        return self._questions_response
+
+    def get_questions_etag(self) -> str:
+        """Return the ETag of the current question bank"""
+        return self._questions_etag
+
+    def _timer_snapshot(self) -> Optional[Dict]:
+        """Compute the current timer without taking any lock
+
+        Reads of exam_start_monotonic and exam_ended are each atomic, and the
+        timer is advisory polling data, so a snapshot straddling a state
+        change is harmless and not worth serializing every poll for.
+        """
+        start = self.exam_start_monotonic
+        if start is None or self.exam_ended:
+            return None
+        elapsed = time.monotonic() - start
+        remaining = max(0, int(self.exam_duration_seconds - elapsed))
+        return {"remaining_seconds": remaining, "duration_seconds": self.exam_duration_seconds}
 
     def get_exam_timer(self) -> Dict:
         """Return remaining time and duration"""
         try:
-            with self.lock:
-                timer = None
-                if self.exam_start_monotonic is not None and not self.exam_ended:
-                    elapsed = time.monotonic() - self.exam_start_monotonic
-                    remaining = max(0, int(self.exam_duration_seconds - elapsed))
-                    timer = {"remaining_seconds": remaining, "duration_seconds": self.exam_duration_seconds}
-                return {"success": True, "timer": timer}
+            return {"success": True, "timer": self._timer_snapshot()}
         except Exception as e:
             return {"success": False, "message": str(e)}
 
+    def _apply_answer_write(self, roll: str, question_id: int, answer: str, lamport_ts: int, mode: str,
+                            log_each: bool = True) -> Dict:
+        """Apply one answer write; caller must hold the stripe lock for roll"""
+        # Accept timestamp as string or int to avoid XML-RPC i4 limits
+        try:
+            received_ts = int(lamport_ts) if lamport_ts is not None else 0
+        except (TypeError, ValueError):
+            received_ts = 0
+        current_ts = self._increment_lamport_clock(received_ts)
+
+        if roll not in self.students:
+            return INVALID_ROLL
+
+        # If final submission exists, reject autosave writes with older/equal Lamport ts
+        final_meta = self.final_submissions.get(roll)
+        if final_meta and mode == "autosave":
+            if received_ts <= final_meta.get("lamport_ts", 0):
+                return FINAL_RECORDED
+
+        student_answers = self.answers.setdefault(roll, {})
+        meta = student_answers.get(question_id)
+        if meta is None:
+            meta = student_answers[question_id] = AnswerMeta()
+
+        # Eventual consistency: last-writer-wins by Lamport ts, tie-breaker by mode (final > autosave)
+        should_write = False
+        if current_ts > meta.lamport_ts:
+            should_write = True
+        elif current_ts == meta.lamport_ts:
+            # Tie-break: final submit beats autosave
+            if mode == "final" and meta.last_write_mode != "final":
+                should_write = True
+
+        if should_write:
+            meta.value = answer
+            meta.lamport_ts = current_ts
+            meta.version += 1
+            meta.last_write_mode = mode
+            next(self._version_counter)
+            if log_each:
+                self._log_event("answer_saved", {"roll": roll, "qid": question_id, "mode": mode, "version": meta.version, "lamport_ts": current_ts})
+            return {"success": True, "version": meta.version, "lamport_ts": current_ts}
+        else:
+            return {"success": False, "reason": "stale_write", "message": "Stale write ignored", "current_ts": meta.lamport_ts}
+
     def submit_answer(self, roll: str, question_id: int, answer: str, lamport_ts: int = None, mode: str = "autosave") -> Dict:
         """Submit or autosave an answer with eventual consistency semantics"""
         try:
-            received_ts = lamport_ts if lamport_ts is not None else 0
-            current_ts = self._increment_lamport_clock(received_ts)
-
-            # Deadlock avoidance order: submit_lock -> answers_lock when final submission exists
-            with self.answers_lock:
-                if roll not in self.students:
-                    return {"success": False, "message": "Invalid roll number"}
-
-                # If final submission exists, reject autosave writes with older/equal Lamport ts
-                final_meta = self.final_submissions.get(roll)
-                if final_meta and mode == "autosave":
-                    if received_ts is None or received_ts <= final_meta.get("lamport_ts", 0):
-                        return {"success": False, "reason": "finalized", "message": "Final submission already recorded"}
-
-                student_answers = self.answers.setdefault(roll, {})
-                meta = student_answers.get(question_id, {"version": 0, "lamport_ts": -1, "value": None, "last_write_mode": None})
-
-                # Eventual consistency: last-writer-wins by Lamport ts, tie-breaker by mode (final > autosave)
-                should_write = False
-                if current_ts > meta["lamport_ts"]:
-                    should_write = True
-                elif current_ts == meta["lamport_ts"]:
-                    # Tie-break: final submit beats autosave
-                    if mode == "final" and meta.get("last_write_mode") != "final":
-                        should_write = True
-
-                if should_write:
-                    meta.update({
-                        "value": answer,
-                        "lamport_ts": current_ts,
-                        "version": meta["version"] + 1,
-                        "last_write_mode": mode
-                    })
-                    student_answers[question_id] = meta
-                    self.version_counter += 1
-                    self._log_event("answer_saved", {"roll": roll, "qid": question_id, "mode": mode, "version": meta["version"], "lamport_ts": current_ts})
-                    return {"success": True, "version": meta["version"], "lamport_ts": current_ts}
-                else:
-                    return {"success": False, "reason": "stale_write", "message": "Stale write ignored", "current_ts": meta["lamport_ts"]}
+            # Answers for different rolls never share state, so autosaves
+            # only contend with writers for the same student
+            with self._slock(roll):
+                return self._apply_answer_write(roll, question_id, answer, lamport_ts, mode)
 
         except Exception as e:
             logger.error(f"Error submitting answer for {roll}: {e}")
             return {"success": False, "message": str(e)}
+
+    def submit_answers_batch(self, roll: str, answers: List, mode: str = "autosave") -> Dict:
+        """Apply a coalesced batch of answer writes in one call
+
+        answers is a list of [question_id, answer, lamport_ts] triples
+        holding only the latest pending value per question, so a burst of
+        autosaves costs one RPC and one lock acquisition instead of N.
+        """
+        try:
+            with self._slock(roll):
+                results = [
+                    self._apply_answer_write(roll, int(question_id), answer, lamport_ts, mode, log_each=False)
+                    for question_id, answer, lamport_ts in answers
+                ]
+            # One event covers the whole batch; per-answer events would undo
+            # the coalescing on the log path
+            self._log_event("answer_batch_saved", {"roll": roll, "mode": mode, "count": len(answers)})
+            return {"success": True, "results": results}
+
+        except Exception as e:
+            logger.error(f"Error submitting answer batch for {roll}: {e}")
+            return {"success": False, "message": str(e)}
     
+    def start_autosave_listener(self, port: int = None):
+        """Start the persistent TCP autosave channel
+
+        Accepts newline-delimited JSON frames {"roll", "qid", "ans", "ts",
+        "mode"} over a long-lived connection and feeds them straight into
+        submit_answer, skipping the per-call XML marshalling and HTTP
+        overhead of the RPC path. Control-plane operations stay on XML-RPC.
+        """
+        listen_port = port if port is not None else self.port + 2000
+        coordinator = self
+
+        class AutosaveHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        frame = json.loads(line)
+                        if "answers" in frame:
+                            result = coordinator.submit_answers_batch(
+                                frame["roll"],
+                                frame["answers"],
+                                frame.get("mode", "autosave")
+                            )
+                        else:
+                            result = coordinator.submit_answer(
+                                frame["roll"],
+                                int(frame["qid"]),
+                                frame["ans"],
+                                frame.get("ts"),
+                                frame.get("mode", "autosave")
+                            )
+                    except Exception as e:
+                        result = {"success": False, "message": str(e)}
+                    self.wfile.write((json.dumps(result) + "\n").encode())
+
+        self.autosave_server = socketserver.ThreadingTCPServer(
+            ("0.0.0.0", listen_port), AutosaveHandler)
+        self.autosave_server.daemon_threads = True
+
+        listener_thread = threading.Thread(
+            target=self.autosave_server.serve_forever, daemon=True)
+        listener_thread.start()
+
+        logger.info(f"Autosave channel listening on port {listen_port}")
+        return self.autosave_server
+
+    def start_binary_listener(self, port: int = None):
+        """Start the MessagePack RPC listener for hot-path calls
+
+        Speaks the same framing as the load balancer's binary fast path:
+        length-prefixed msgpack, request (method, params), response
+        (ok, payload). Binary encoding skips the XML marshalling that
+        dominates per-call CPU for submit_answer/report_time/get_status,
+        and msgpack's native 64-bit ints need none of the str(timestamp)
+        workarounds XML-RPC's i4 limit forces. Disabled (with XML-RPC
+        still fully functional) when msgpack is not installed.
+        """
+        if msgpack is None:
+            logger.info("msgpack not installed; binary RPC listener disabled")
+            return None
+        listen_port = port if port is not None else self.port + BINARY_RPC_PORT_OFFSET
+        methods = {name: getattr(self, name) for name in (
+            "register_student", "start_exam", "cheating", "submit_exam",
+            "report_time", "report_times_batch", "request_cs", "reply_cs",
+            "get_status", "get_dashboard", "wait_for_change", "end_exam",
+            "release_cs", "get_questions", "get_questions_etag",
+            "get_exam_timer", "submit_answer", "submit_answers_batch",
+        )}
+
+        class BinaryRPCHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                sock = self.request
+                try:
+                    while True:
+                        header = self._recv_exact(4)
+                        if header is None:
+                            break
+                        body = self._recv_exact(int.from_bytes(header, "big"))
+                        if body is None:
+                            break
+                        try:
+                            method, params = msgpack.unpackb(body, raw=False)
+                            func = methods.get(method)
+                            if func is None:
+                                reply = (False, f"Unknown method: {method}")
+                            else:
+                                reply = (True, func(*params))
+                        except Exception as e:
+                            reply = (False, str(e))
+                        payload = msgpack.packb(reply, use_bin_type=True, default=str)
+                        sock.sendall(len(payload).to_bytes(4, "big") + payload)
+                except OSError:
+                    pass  # client went away; connection is per-session
+
+            def _recv_exact(self, n):
+                chunks = []
+                while n > 0:
+                    chunk = self.request.recv(n)
+                    if not chunk:
+                        return None
+                    chunks.append(chunk)
+                    n -= len(chunk)
+                return b"".join(chunks)
+
+        self.binary_server = socketserver.ThreadingTCPServer(
+            ("0.0.0.0", listen_port), BinaryRPCHandler)
+        self.binary_server.daemon_threads = True
+
+        listener_thread = threading.Thread(
+            target=self.binary_server.serve_forever, daemon=True)
+        listener_thread.start()
+
+        logger.info(f"Binary RPC listener on port {listen_port}")
+        return self.binary_server
+
+    def start_http_listener(self, port: int = None):
+        """Start the read-only HTTP listener for poll-heavy GET endpoints
+
+        Serves GET /questions (immutable for the exam, long max-age) and
+        GET /timer (ETag = whole remaining seconds) with 304 revalidation,
+        so repeated polls cost a conditional request instead of a full
+        XML-RPC body each time. Mutating calls stay on XML-RPC.
+        """
+        listen_port = port if port is not None else self.port + HTTP_GET_PORT_OFFSET
+        coordinator = self
+        questions_body = _dumps(self._questions_response).encode()
+        questions_etag = f'"{self._questions_etag}"'
+
+        class ReadOnlyGETHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/questions":
+                    self._conditional_reply(
+                        questions_body, questions_etag, "max-age=3600, immutable")
+                elif self.path == "/timer":
+                    timer = coordinator._timer_snapshot()
+                    etag = '"{}"'.format(
+                        timer["remaining_seconds"] if timer else "none")
+                    body = _dumps({"success": True, "timer": timer}).encode()
+                    self._conditional_reply(body, etag, "no-cache")
+                else:
+                    self.send_error(404)
+
+            def _conditional_reply(self, body, etag, cache_control):
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", cache_control)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Poll traffic would swamp the log
+
+        self.http_server = ThreadingHTTPServer(("0.0.0.0", listen_port), ReadOnlyGETHandler)
+        self.http_server.daemon_threads = True
+
+        listener_thread = threading.Thread(
+            target=self.http_server.serve_forever, daemon=True)
+        listener_thread.start()
+
+        logger.info(f"HTTP GET listener on port {listen_port}")
+        return self.http_server
+
     def request_cs(self, roll: str, timestamp) -> Dict:
         """Request critical section access using Ricart-Agrawala algorithm"""
         try:
@@ -405,7 +970,7 @@ class ExamCoordinator:
                 lamport_ts = self._increment_lamport_clock(ts_int)
                 
                 if roll not in self.students:
-                    return {"success": False, "message": "Invalid roll number"}
+                    return INVALID_ROLL
                 
                 # Add to request queue
                 request = {
@@ -414,23 +979,25 @@ class ExamCoordinator:
                     "request_time": time.time()
                 }
                 
-                self.cs_queue.append(request)
-                self.cs_queue.sort(key=lambda x: (x["timestamp"], x["roll"]))  # Sort by timestamp, then roll
-                
+                # O(log N) heap insert ordered by (timestamp, roll); any
+                # previous entry for this roll goes stale via pending_requests
+                heapq.heappush(self.cs_queue, (lamport_ts, roll, request))
+                self._queue_rolls.add(roll)
+
                 self.pending_requests[roll] = request
                 self.received_replies = set()
-                
+
                 self._log_event("cs_request", {
                     "roll": roll,
                     "timestamp": lamport_ts,
-                    "queue_length": len(self.cs_queue)
+                    "queue_length": len(self._queue_rolls)
                 })
-                
+
                 # Check if this request can be granted immediately
                 if self._can_grant_cs(request):
                     return self._grant_cs(request)
                 else:
-                    return {"success": True, "message": "Request queued", "position": len(self.cs_queue)}
+                    return {"success": True, "message": "Request queued", "position": len(self._queue_rolls)}
                 
         except Exception as e:
             logger.error(f"Error requesting CS for {roll}: {e}")
@@ -447,7 +1014,7 @@ class ExamCoordinator:
                 self._increment_lamport_clock(ts_int)
                 
                 if roll in self.received_replies:
-                    return {"success": False, "message": "Already replied"}
+                    return ALREADY_REPLIED
                 
                 self.received_replies.add(roll)
                 
@@ -457,32 +1024,47 @@ class ExamCoordinator:
                 })
                 
                 # Check if we can grant CS to the next in queue
-                if self.cs_queue and self._can_grant_cs(self.cs_queue[0]):
-                    return self._grant_cs(self.cs_queue[0])
-                
+                head = self._peek_cs_queue()
+                if head is not None and self._can_grant_cs(head):
+                    return self._grant_cs(head)
+
                 return {"success": True, "message": "Reply recorded"}
                 
         except Exception as e:
             logger.error(f"Error replying to CS for {roll}: {e}")
             return {"success": False, "message": f"CS reply failed: {str(e)}"}
     
+    def _peek_cs_queue(self) -> Optional[Dict]:
+        """Return the live head request, discarding stale heap entries
+
+        An entry is live only while pending_requests still points at its
+        request dict; granted or superseded entries are dropped lazily here
+        instead of with an O(N) list removal.
+        """
+        while self.cs_queue:
+            _, roll, request = self.cs_queue[0]
+            if self.pending_requests.get(roll) is request:
+                return request
+            heapq.heappop(self.cs_queue)
+        return None
+
     def _can_grant_cs(self, request: Dict) -> bool:
         """Check if critical section can be granted to a request"""
         if self.cs_holder is not None:
             return False
-        
-        # Check if we have replies from all other processes
-        other_rolls = [r["roll"] for r in self.cs_queue if r["roll"] != request["roll"]]
-        return all(roll in self.received_replies for roll in other_rolls)
-    
+
+        # Check if we have replies from all other queued rolls
+        other_rolls = self._queue_rolls - {request["roll"]}
+        return other_rolls <= self.received_replies
+
     def _grant_cs(self, request: Dict) -> Dict:
         """Grant critical section access"""
         self.cs_holder = request["roll"]
-        self.cs_queue.remove(request)
-        
-        if request["roll"] in self.pending_requests:
-            del self.pending_requests[request["roll"]]
-        
+        self.pending_requests.pop(request["roll"], None)
+        self._queue_rolls.discard(request["roll"])
+        # The granted entry is now stale; sweep it off the heap head
+        self._peek_cs_queue()
+
         self._log_event("cs_granted", {
             "roll": request["roll"],
             "timestamp": request["timestamp"]
@@ -499,7 +1081,7 @@ class ExamCoordinator:
         try:
             with self.cs_lock:
                 if self.cs_holder != roll:
-                    return {"success": False, "message": "Not the current holder"}
+                    return NOT_CS_HOLDER
                 
                 self.cs_holder = None
                 self.received_replies.clear()
@@ -507,10 +1089,9 @@ class ExamCoordinator:
                 self._log_event("cs_released", {"roll": roll})
                 
                 # Check if next request can be granted
-                if self.cs_queue:
-                    next_request = self.cs_queue[0]
-                    if self._can_grant_cs(next_request):
-                        return self._grant_cs(next_request)
+                next_request = self._peek_cs_queue()
+                if next_request is not None and self._can_grant_cs(next_request):
+                    return self._grant_cs(next_request)
                 
                 return {"success": True, "message": "Critical section released"}
                 
@@ -521,64 +1102,115 @@ class ExamCoordinator:
     def get_status(self, roll: str = None) -> Dict:
         """Get status of a specific student or all students"""
         try:
-            with self.lock:
-                if roll:
+            if roll:
+                with self._slock(roll):
                     if roll not in self.students:
-                        return {"success": False, "message": "Invalid roll number"}
-                    timer = None
-                    if self.exam_start_monotonic is not None and not self.exam_ended:
-                        elapsed = time.monotonic() - self.exam_start_monotonic
-                        remaining = max(0, int(self.exam_duration_seconds - elapsed))
-                        timer = {"remaining_seconds": remaining, "duration_seconds": self.exam_duration_seconds}
-                    return {
-                        "success": True,
-                        "student": self.students[roll].copy(),
-                        "cs_holder": self.cs_holder,
-                        "exam_started": self.exam_started,
-                        "exam_ended": self.exam_ended,
-                        "timer": timer
-                    }
-                else:
-                    timer = None
-                    if self.exam_start_monotonic is not None and not self.exam_ended:
-                        elapsed = time.monotonic() - self.exam_start_monotonic
-                        remaining = max(0, int(self.exam_duration_seconds - elapsed))
-                        timer = {"remaining_seconds": remaining, "duration_seconds": self.exam_duration_seconds}
+                        return INVALID_ROLL
+                    timer = self._timer_snapshot()
                     return {
                         "success": True,
-                        "students": {k: v.copy() for k, v in self.students.items()},
+                        "student": self.students[roll],
                         "cs_holder": self.cs_holder,
                         "exam_started": self.exam_started,
                         "exam_ended": self.exam_ended,
-                        "total_students": len(self.students),
                         "timer": timer
                     }
+            with self.lock:
+                timer = self._timer_snapshot()
+                return {
+                    "success": True,
+                    # Entries are copy-on-write, so sharing references is safe
+                    "students": dict(self.students),
+                    "cs_holder": self.cs_holder,
+                    "exam_started": self.exam_started,
+                    "exam_ended": self.exam_ended,
+                    "total_students": len(self.students),
+                    "timer": timer
+                }
                     
         except Exception as e:
             logger.error(f"Error getting status: {e}")
             return {"success": False, "message": f"Status retrieval failed: {str(e)}"}
     
+    def get_dashboard(self) -> Dict:
+        """Return student status and exam timer in one combined response
+
+        One RPC replaces the separate get_status + get_exam_timer polls the
+        teacher dashboard used to make per refresh.
+        """
+        try:
+            status = self.get_status()
+            timer = self.get_exam_timer()
+            return {
+                "success": status.get("success", False),
+                "status": status,
+                "timer": timer.get("timer") if timer.get("success") else None
+            }
+        except Exception as e:
+            logger.error(f"Error getting dashboard: {e}")
+            return {"success": False, "message": f"Dashboard retrieval failed: {str(e)}"}
+
+    def wait_for_change(self, client_version: int = 0, timeout: int = 25) -> Dict:
+        """Block until system state moves past client_version, then return status
+
+        Long-poll alternative to periodic get_status: dashboards pass the
+        last version they saw and only get woken when something changed
+        (or the timeout expires, as a keepalive heartbeat).
+        """
+        try:
+            with self.state_cv:
+                self.state_cv.wait_for(
+                    lambda: self.state_version != client_version,
+                    timeout=timeout
+                )
+                version = self.state_version
+
+            status = self.get_status()
+            status["version"] = version
+            return status
+
+        except Exception as e:
+            logger.error(f"Error waiting for state change: {e}")
+            return {"success": False, "message": f"Wait for change failed: {str(e)}"}
+
     def end_exam(self) -> Dict:
         """End the exam for all students"""
         try:
             with self.lock:
                 if not self.exam_started:
-                    return {"success": False, "message": "Exam not started"}
-                
+                    return EXAM_NOT_STARTED
+
                 self.exam_ended = True
                 self.exam_started = False
                 self.exam_start_monotonic = None
-                
-                # Auto-submit remaining students
-                for roll, student in self.students.items():
-                    if student["status"] == "in_progress":
-                        student["status"] = "submitted"
-                        student["submission_mode"] = "auto"
-                        student["last_activity"] = time.time()
-                
-                self._log_event("exam_ended", {"total_students": len(self.students)})
-                
-                return {"success": True, "message": "Exam ended successfully"}
+                rolls = list(self.students)
+
+            # Auto-submit remaining students; the status check and the
+            # rebind must share the stripe or a racing manual submit or
+            # termination is silently overwritten. Stripes nest outside
+            # self.lock (see start_exam) to keep lock order consistent with
+            # the answer-write path.
+            for roll in rolls:
+                with self._slock(roll):
+                    student = self.students.get(roll)
+                    if student is not None and student["status"] == "in_progress":
+                        self._mutate_student(
+                            roll,
+                            status="submitted",
+                            submission_mode="auto",
+                            last_activity=time.time()
+                        )
+
+            self._log_event("exam_ended", {"total_students": len(rolls)})
+
+            if self.rpc_server is not None:
+                self.rpc_server.invalidate_response_cache()
+
+            # Wake the Berkeley sync worker so it observes exam_ended and
+            # exits instead of sleeping out its interval
+            with self._sync_cv:
+                self._sync_cv.notify_all()
+            return {"success": True, "message": "Exam ended successfully"}
                 
         except Exception as e:
             logger.error(f"Error ending exam: {e}")
@@ -589,8 +1221,10 @@ def create_server(port: int = 8000, replica_id: str = "master"):
     coordinator = ExamCoordinator(port, replica_id)
     
     try:
-        server = SimpleXMLRPCServer(("0.0.0.0", port), allow_none=True)
+        server = CachingXMLRPCServer(("0.0.0.0", port), allow_none=True)
         server.register_introspection_functions()
+        server.register_multicall_functions()  # Allow clients to batch RPCs
+        coordinator.rpc_server = server
         
         # Register all methods
         server.register_function(coordinator.register_student, "register_student")
@@ -598,16 +1232,30 @@ def create_server(port: int = 8000, replica_id: str = "master"):
         server.register_function(coordinator.cheating, "cheating")
         server.register_function(coordinator.submit_exam, "submit_exam")
         server.register_function(coordinator.report_time, "report_time")
+        server.register_function(coordinator.report_times_batch, "report_times_batch")
         server.register_function(coordinator.request_cs, "request_cs")
         server.register_function(coordinator.reply_cs, "reply_cs")
         server.register_function(coordinator.get_status, "get_status")
+        server.register_function(coordinator.wait_for_change, "wait_for_change")
+        server.register_function(coordinator.get_dashboard, "get_dashboard")
         server.register_function(coordinator.end_exam, "end_exam")
         server.register_function(coordinator.release_cs, "release_cs")
         # New RPC APIs
         server.register_function(coordinator.get_questions, "get_questions")
+        server.register_function(coordinator.get_questions_etag, "get_questions_etag")
         server.register_function(coordinator.get_exam_timer, "get_exam_timer")
         server.register_function(coordinator.submit_answer, "submit_answer")
-        
+        server.register_function(coordinator.submit_answers_batch, "submit_answers_batch")
+
+        # Persistent binary-framed channel for the hot autosave path
+        coordinator.start_autosave_listener()
+
+        # MessagePack fast path used by the load balancer when available
+        coordinator.start_binary_listener()
+
+        # Read-only GET endpoints with ETag revalidation for poll traffic
+        coordinator.start_http_listener()
+
         logger.info(f"XML-RPC Server starting on port {port} (Replica: {replica_id})")
         return server, coordinator
     except Exception as e:
@@ -10,7 +10,46 @@ import sys
 import os
 import signal
 import threading
+import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.request import urlopen
+
+class _SpawnedProcess:
+    """Minimal Popen-alike around a pid from os.posix_spawn
+
+    Exposes just the surface SystemManager touches: pid, poll, wait,
+    terminate, and kill, with reaping via non-blocking waitpid.
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                self.returncode = 0  # Already reaped elsewhere
+                return self.returncode
+            if pid == self.pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def wait(self, timeout=None):
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def terminate(self):
+        os.kill(self.pid, signal.SIGTERM)
+
+    def kill(self):
+        os.kill(self.pid, signal.SIGKILL)
 
 class SystemManager:
     """Manages starting and stopping all system components"""
@@ -18,6 +57,8 @@ class SystemManager:
     def __init__(self):
         self.processes = []
         self.running = False
+        self._child_exited = threading.Event()
+        self.stop_event = threading.Event()
         
     def start_component(self, name, command_args, cwd=None, wait_time=0):
         """Start a system component using current Python interpreter"""
@@ -33,13 +74,23 @@ class SystemManager:
                     parts = parts[1:]
                 args = [sys.executable] + parts
 
-            process = subprocess.Popen(
-                args,
-                cwd=cwd,
-                stdout=None,  # inherit parent stdout
-                stderr=None,  # inherit parent stderr
-                preexec_fn=os.setsid if os.name != 'nt' else None
-            )
+            if os.name != 'nt' and cwd is None:
+                # posix_spawn goes straight to the kernel's spawn path with
+                # no fork page-table copy; cwd-bound components still use
+                # Popen since posix_spawn cannot chdir
+                pid = os.posix_spawn(sys.executable, args, os.environ)
+                process = _SpawnedProcess(pid)
+            else:
+                # start_new_session keeps CPython's vfork fast path, which
+                # preexec_fn=os.setsid would disable
+                process = subprocess.Popen(
+                    args,
+                    cwd=cwd,
+                    stdout=None,  # inherit parent stdout
+                    stderr=None,  # inherit parent stderr
+                    close_fds=True,
+                    start_new_session=(os.name != 'nt')
+                )
             self.processes.append((name, process))
             print(f"✓ {name} started (PID: {process.pid})")
             
@@ -58,49 +109,40 @@ class SystemManager:
         print("="*60)
         print("ONLINE EXAM PROCTORING SYSTEM - STARTUP")
         print("="*60)
-        
-        # Start main coordinator server
-        self.start_component(
-            "Main Coordinator Server",
-            ["server.py", "8010", "master"],
-            wait_time=0
-        )
-        
-        # Start replica servers
-        self.start_component(
-            "Replica Server 1",
-            ["server.py", "8011", "replica1"],
-            wait_time=0
-        )
-        
-        self.start_component(
-            "Replica Server 2", 
-            ["server.py", "8012", "replica2"],
-            wait_time=0
-        )
-        
-        # Start load balancer
-        self.start_component(
-            "Load Balancer",
-            ["load_balancer.py", "9010", "http://127.0.0.1:8010,http://127.0.0.1:8011,http://127.0.0.1:8012"],
-            wait_time=0
-        )
-        
-        # Start Flask web interface
-        self.start_component(
-            "Flask Web Interface",
-            ["app.py"],
-            cwd="frontend",
-            wait_time=0
-        )
 
-        # Health checks
+        self.install_child_watcher()
+
+        # Fire every Popen back to back — the components boot independently
+        # and readiness is gated by the concurrent health checks below, not
+        # by per-spawn sleeps
+        components = [
+            ("Main Coordinator Server", ["server.py", "8010", "master"], None),
+            ("Replica Server 1", ["server.py", "8011", "replica1"], None),
+            ("Replica Server 2", ["server.py", "8012", "replica2"], None),
+            ("Load Balancer",
+             ["load_balancer.py", "9010",
+              "http://127.0.0.1:8010,http://127.0.0.1:8011,http://127.0.0.1:8012"],
+             None),
+            ("Flask Web Interface", ["app.py"], "frontend"),
+        ]
+        for name, args, cwd in components:
+            self.start_component(name, args, cwd=cwd)
+
+        # Health checks run concurrently: the components boot in parallel,
+        # so probing them one after another just sums their startup times
         print("\nPerforming health checks...")
-        servers_ok = self.wait_for_xmlrpc("http://127.0.0.1:8010", name="Main Coordinator Server")
-        repl1_ok = self.wait_for_xmlrpc("http://127.0.0.1:8011", name="Replica Server 1")
-        repl2_ok = self.wait_for_xmlrpc("http://127.0.0.1:8012", name="Replica Server 2")
-        lb_ok = self.wait_for_balancer("http://127.0.0.1:9010")
-        ui_ok = self.wait_for_http("http://127.0.0.1:5001") or self.wait_for_http("http://127.0.0.1:5000")
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            servers_f = pool.submit(self.wait_for_xmlrpc, "http://127.0.0.1:8010", "Main Coordinator Server")
+            repl1_f = pool.submit(self.wait_for_xmlrpc, "http://127.0.0.1:8011", "Replica Server 1")
+            repl2_f = pool.submit(self.wait_for_xmlrpc, "http://127.0.0.1:8012", "Replica Server 2")
+            lb_f = pool.submit(self.wait_for_balancer, "http://127.0.0.1:9010")
+            ui_f = pool.submit(
+                lambda: self.wait_for_http("http://127.0.0.1:5001") or self.wait_for_http("http://127.0.0.1:5000"))
+            servers_ok = servers_f.result()
+            repl1_ok = repl1_f.result()
+            repl2_ok = repl2_f.result()
+            lb_ok = lb_f.result()
+            ui_ok = ui_f.result()
         
         self.running = True
         print("\n" + "="*60)
@@ -121,7 +163,9 @@ class SystemManager:
         for name, process in self.processes:
             try:
                 print(f"Stopping {name}...")
-                if os.name == 'nt':
+                # posix_spawn children share our process group, so signal
+                # the pid directly; Popen children got their own session
+                if os.name == 'nt' or isinstance(process, _SpawnedProcess):
                     process.terminate()
                 else:
                     os.killpg(os.getpgid(process.pid), signal.SIGTERM)
@@ -129,7 +173,7 @@ class SystemManager:
                 print(f"✓ {name} stopped")
             except subprocess.TimeoutExpired:
                 print(f"Force killing {name}...")
-                if os.name == 'nt':
+                if os.name == 'nt' or isinstance(process, _SpawnedProcess):
                     process.kill()
                 else:
                     os.killpg(os.getpgid(process.pid), signal.SIGKILL)
@@ -144,26 +188,32 @@ class SystemManager:
     def check_service_health(self, url, name):
         """Check if a service is responding"""
         try:
-            import xmlrpc.client
             proxy = xmlrpc.client.ServerProxy(url, allow_none=True)
             result = proxy.get_status()
             return result.get("success", False)
         except:
             return False
 
-    def wait_for_xmlrpc(self, url, name, retries=20, delay=0.5):
+    # Probes back off exponentially: cheap early retries catch services
+    # that come up in tens of milliseconds without hammering slow ones
+    PROBE_INITIAL_DELAY = 0.05
+    PROBE_MAX_DELAY = 1.0
+
+    def wait_for_xmlrpc(self, url, name, retries=20, delay=None):
         """Wait until an XML-RPC endpoint is healthy"""
+        delay = delay if delay is not None else self.PROBE_INITIAL_DELAY
         for _ in range(retries):
             if self.check_service_health(url, name):
                 print(f"✓ {name} is healthy at {url}")
                 return True
             time.sleep(delay)
+            delay = min(delay * 1.5, self.PROBE_MAX_DELAY)
         print(f"✗ {name} not healthy at {url}")
         return False
 
-    def wait_for_balancer(self, url, retries=20, delay=0.5):
+    def wait_for_balancer(self, url, retries=20, delay=None):
+        delay = delay if delay is not None else self.PROBE_INITIAL_DELAY
         try:
-            import xmlrpc.client
             proxy = xmlrpc.client.ServerProxy(url, allow_none=True)
             for _ in range(retries):
                 try:
@@ -172,14 +222,15 @@ class SystemManager:
                     return True
                 except Exception:
                     time.sleep(delay)
+                    delay = min(delay * 1.5, self.PROBE_MAX_DELAY)
         except Exception:
             pass
         print(f"✗ Load Balancer not healthy at {url}")
         return False
 
-    def wait_for_http(self, url, retries=40, delay=0.5):
+    def wait_for_http(self, url, retries=40, delay=None):
+        delay = delay if delay is not None else self.PROBE_INITIAL_DELAY
         try:
-            from urllib.request import urlopen
             for _ in range(retries):
                 try:
                     with urlopen(url) as resp:
@@ -188,13 +239,35 @@ class SystemManager:
                             return True
                 except Exception:
                     time.sleep(delay)
+                    delay = min(delay * 1.5, self.PROBE_MAX_DELAY)
         except Exception:
             pass
         print(f"✗ Web UI not responding at {url}")
         return False
     
+    def _on_sigchld(self, signum, frame):
+        """Wake the monitor when any child exits"""
+        self._child_exited.set()
+
+    def install_child_watcher(self):
+        """Arrange for SIGCHLD to drive the process monitor on POSIX"""
+        if os.name != 'nt':
+            signal.signal(signal.SIGCHLD, self._on_sigchld)
+
     def monitor_processes(self):
         """Monitor running processes"""
+        if os.name != 'nt':
+            # SIGCHLD-driven: the monitor sleeps until a child actually
+            # exits instead of polling every process on a 5s timer
+            while self.running:
+                if not self._child_exited.wait(timeout=60):
+                    continue
+                self._child_exited.clear()
+                for name, process in self.processes:
+                    if process.poll() is not None:
+                        print(f"⚠ {name} has stopped unexpectedly")
+            return
+        # Windows has no SIGCHLD; fall back to polling
         while self.running:
             try:
                 for name, process in self.processes:
@@ -243,6 +316,7 @@ class SystemManager:
 def signal_handler(signum, frame):
     """Handle interrupt signals"""
     print("\nReceived interrupt signal...")
+    manager.stop_event.set()
     manager.stop_all()
     sys.exit(0)
 
@@ -285,10 +359,9 @@ def main():
         elif run_tests:
             manager.run_tests()
         
-        # Keep running until interrupted
-        while manager.running:
-            time.sleep(1)
-            
+        # Park until a signal asks us to stop; no per-second wakeups
+        manager.stop_event.wait()
+
     except KeyboardInterrupt:
         pass
     finally:
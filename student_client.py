@@ -7,10 +7,15 @@ Simulates student behavior with clock skew, cheating detection, and CS requests
 import time
 import random
 import threading
-import json
+import heapq
+import itertools
 import logging
-from datetime import datetime
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape
 from typing import Dict, Optional
+import http.client
 import xmlrpc.client
 
 # Configure logging
@@ -20,11 +25,148 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Hoisted so behavior ticks don't rebuild the candidate list every pick
+_ACTIVITIES = ("normal_work", "time_report", "cs_request", "cheating_simulation")
+
+# Lamport timestamps go over the wire as strings (XML-RPC's i4 limit);
+# clocks start small, so the common values come from one prebuilt table
+_TS_STRINGS = tuple(str(i) for i in range(1024))
+
+def _ts_str(timestamp: int) -> str:
+    """Stringify a Lamport timestamp without allocating for small values"""
+    return _TS_STRINGS[timestamp] if 0 <= timestamp < 1024 else str(timestamp)
+
+# Pre-built request envelopes for the hottest RPCs. Their argument shapes
+# are fixed, so one str.format replaces a full Marshaller run per call.
+_XML_HEADER = "<?xml version='1.0'?>\n"
+_CALL_TEMPLATES = {
+    "report_time": (
+        _XML_HEADER + "<methodCall><methodName>report_time</methodName>"
+        "<params><param><value><string>{}</string></value></param>"
+        "<param><value><double>{}</double></value></param></params></methodCall>"
+    ),
+    "get_status": (
+        _XML_HEADER + "<methodCall><methodName>get_status</methodName>"
+        "<params><param><value><string>{}</string></value></param></params></methodCall>"
+    ),
+    "cheating": (
+        _XML_HEADER + "<methodCall><methodName>cheating</methodName>"
+        "<params><param><value><string>{}</string></value></param>"
+        "<param><value><string>{}</string></value></param></params></methodCall>"
+    ),
+}
+
+class _FastPathUnavailable(Exception):
+    """Fast-path failure before the request reached the server"""
+
+class TimeReportBatcher:
+    """Coalesces report_time calls from many students into one RPC
+
+    Berkeley collection wants everyone's time anyway, so instead of N
+    clients each paying a round-trip, reports landing within a 100ms
+    window ride one report_times_batch call and the per-student offsets
+    are fanned back out through futures.
+    """
+
+    window = 0.1  # Seconds to wait for co-travellers before flushing
+
+    _instances: Dict[str, "TimeReportBatcher"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_url(cls, server_url: str) -> "TimeReportBatcher":
+        """Return the shared batcher for a coordinator URL"""
+        with cls._instances_lock:
+            batcher = cls._instances.get(server_url)
+            if batcher is None:
+                batcher = cls._instances[server_url] = cls(server_url)
+            return batcher
+
+    def __init__(self, server_url: str):
+        # The default transport already holds one keep-alive connection
+        # per proxy instance
+        self.proxy = xmlrpc.client.ServerProxy(server_url, allow_none=True)
+        self._lock = threading.Lock()
+        self._pending = []  # (roll, local_time, future) awaiting the flush
+
+    def submit(self, roll: str, local_time: float) -> Future:
+        """Queue one report; the returned future resolves to a result dict"""
+        future = Future()
+        with self._lock:
+            self._pending.append((roll, local_time, future))
+            start_timer = len(self._pending) == 1
+        if start_timer:
+            timer = threading.Timer(self.window, self._flush)
+            timer.daemon = True
+            timer.start()
+        return future
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            result = self.proxy.report_times_batch(
+                [[roll, local_time] for roll, local_time, _ in batch])
+            offsets = result.get("offsets", {}) if result.get("success") else {}
+            for roll, _, future in batch:
+                if roll in offsets:
+                    future.set_result({"success": True, "offset": offsets[roll]})
+                else:
+                    future.set_result({
+                        "success": False,
+                        "message": result.get("message", "No offset returned")
+                    })
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_result({"success": False, "message": str(e)})
+
 class StudentClient:
     """Simulates a student client with clock skew and exam behavior"""
-    
-    def __init__(self, roll: str, server_url: str = "http://127.0.0.1:8000", 
-                 clock_skew: float = 0.0, name: str = None):
+
+    # Behavior ticks for every client share one worker pool and one
+    # scheduler thread, keyed by a (fire_time, seq, fn) heap. A dedicated
+    # daemon thread per student caps simulations at a few hundred clients;
+    # the shared pool keeps thread count flat however many are running.
+    _executor: Optional[ThreadPoolExecutor] = None
+    _scheduler_heap = []
+    _scheduler_cv = threading.Condition()
+    _scheduler_seq = itertools.count()
+
+    @classmethod
+    def _schedule(cls, delay: float, fn) -> None:
+        """Run fn on the shared pool after delay seconds"""
+        with cls._scheduler_cv:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 8) * 4),
+                    thread_name_prefix="student-tick",
+                )
+                threading.Thread(target=cls._scheduler_loop, daemon=True).start()
+            heapq.heappush(
+                cls._scheduler_heap,
+                (time.monotonic() + delay, next(cls._scheduler_seq), fn),
+            )
+            cls._scheduler_cv.notify()
+
+    @classmethod
+    def _scheduler_loop(cls):
+        while True:
+            with cls._scheduler_cv:
+                while not cls._scheduler_heap:
+                    cls._scheduler_cv.wait()
+                fire_time, _, fn = cls._scheduler_heap[0]
+                remaining = fire_time - time.monotonic()
+                if remaining > 0:
+                    cls._scheduler_cv.wait(timeout=remaining)
+                    continue
+                heapq.heappop(cls._scheduler_heap)
+            cls._executor.submit(fn)
+
+    def __init__(self, roll: str, server_url: str = "http://127.0.0.1:8000",
+                 clock_skew: float = 0.0, name: str = None,
+                 use_fast_path: bool = True):
         self.roll = roll
         self.name = name or f"Student_{roll}"
         self.server_url = server_url
@@ -35,9 +177,20 @@ class StudentClient:
         self.marks = 100.0
         self.warnings = 0
         self.last_activity = time.time()
-        
-        # XML-RPC proxy
+        # Own RNG per student: the module-level random functions all share
+        # one instance, which contends across concurrently ticking clients
+        self._rng = random.Random(int(roll) if roll.isdigit() else hash(roll))
+
+        # One proxy per student: the stdlib transport caches a keep-alive
+        # connection per instance, so this is one TCP handshake per student
+        # instead of one per RPC
         self.proxy = xmlrpc.client.ServerProxy(server_url, allow_none=True)
+        # Template fast path state (see _fast_call); tests pass
+        # use_fast_path=False so they stay on the (mocked) proxy instead
+        # of opening a real socket to the coordinator port
+        self.use_fast_path = use_fast_path
+        self._rpc_netloc = urlparse(server_url).netloc
+        self._fast_conn = None
         
         # Threading
         self.running = False
@@ -45,9 +198,73 @@ class StudentClient:
         
         logger.info(f"Student {self.roll} initialized with clock skew {clock_skew}s")
     
+    def _fast_call(self, method: str, *args):
+        """Send a templated XML-RPC request over the cached connection
+
+        For the fixed-shape hot methods the request body is one str.format
+        into a prebuilt envelope instead of a Marshaller run; only the
+        response still goes through xmlrpc.client.loads.
+
+        Raises _FastPathUnavailable only when the request provably never
+        reached the server; response-phase failures propagate as-is
+        because the server may already have processed the call.
+        """
+        body = _CALL_TEMPLATES[method].format(
+            *(escape(a) if isinstance(a, str) else repr(a) for a in args)
+        ).encode()
+        conn = self._fast_conn
+        if conn is None:
+            conn = http.client.HTTPConnection(self._rpc_netloc)
+            try:
+                conn.connect()
+            except OSError as e:
+                raise _FastPathUnavailable() from e
+            self._fast_conn = conn
+        try:
+            conn.request("POST", "/", body, {"Content-Type": "text/xml"})
+        except Exception as e:
+            # Send failed (stale keep-alive socket, reset before dispatch);
+            # the server never saw the request, so a retry is safe
+            self._fast_conn = None
+            raise _FastPathUnavailable() from e
+        try:
+            data = conn.getresponse().read()
+        except Exception:
+            self._fast_conn = None  # Stale socket; next call reconnects
+            raise
+        params, _ = xmlrpc.client.loads(data)
+        return params[0]
+
+    def _call(self, method: str, *args):
+        """Dispatch an RPC, preferring the template fast path"""
+        if not self.use_fast_path:
+            return getattr(self.proxy, method)(*args)
+        try:
+            return self._fast_call(method, *args)
+        except xmlrpc.client.Fault:
+            raise
+        except _FastPathUnavailable:
+            # The request was never delivered, so reissuing is safe even
+            # for non-idempotent methods like cheating
+            return getattr(self.proxy, method)(*args)
+
+    @property
+    def clock_offset(self) -> float:
+        """Applied offset from Berkeley sync"""
+        return self._clock_offset
+
+    @clock_offset.setter
+    def clock_offset(self, value: float) -> None:
+        self._clock_offset = value
+        # skew + offset folded into one value; _get_local_time runs on
+        # every RPC and behavior tick, so it pays one add instead of two.
+        # The setter keeps the folded value fresh for any writer, including
+        # the demo's direct offset assignments.
+        self._total_offset = self.clock_skew + value
+
     def _get_local_time(self) -> float:
         """Get local time with applied clock skew and offset"""
-        return time.time() + self.clock_skew + self.clock_offset
+        return time.time() + self._total_offset
     
     def _increment_lamport_clock(self, received_timestamp: int = None) -> int:
         """Increment and return Lamport clock value"""
@@ -59,14 +276,11 @@ class StudentClient:
     
     def _log_event(self, event: str, data: Dict = None):
         """Log student events"""
-        timestamp = datetime.now().isoformat()
-        log_entry = {
-            "timestamp": timestamp,
-            "roll": self.roll,
-            "event": event,
-            "data": data or {}
-        }
-        logger.info(f"STUDENT {self.roll}: {event} - {json.dumps(data)}")
+        # Bail before formatting: when INFO is filtered out this costs one
+        # level check, not a serialization per student action
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info("STUDENT %s: %s - %s", self.roll, event, data)
     
     def register(self) -> bool:
         """Register with the exam coordinator"""
@@ -83,48 +297,88 @@ class StudentClient:
             return False
     
     def start_exam(self) -> bool:
-        """Wait for exam to start and update local status"""
+        """Wait for exam to start and update local status
+
+        Long-polls the coordinator's wait_for_change instead of hammering
+        get_status once a second: the server parks the request until state
+        actually moves (or its keepalive timeout fires), so waiting costs
+        one in-flight RPC rather than a poll per student per second.
+        """
         try:
-            # Poll server until exam starts
+            version = 0
             while True:
-                result = self.proxy.get_status(self.roll)
+                result = self.proxy.wait_for_change(version, 25)
                 if result.get("success") and result.get("exam_started"):
                     self.exam_status = "in_progress"
                     self._log_event("exam_started")
                     return True
-                time.sleep(1)
+                version = result.get("version", version)
         except Exception as e:
             logger.error(f"Error starting exam: {e}")
             return False
     
+    def _apply_time_report(self, local_time: float, result: Dict) -> bool:
+        """Apply the server's response to a time report"""
+        if result.get("success"):
+            # Apply correction from server
+            if "offset" in result:
+                self.clock_offset = result["offset"]
+                self._log_event("time_corrected", {
+                    "reported_time": local_time,
+                    "correction": result["offset"],
+                    "new_offset": self.clock_offset
+                })
+            return True
+        else:
+            logger.error(f"Time report failed: {result.get('message')}")
+            return False
+
     def report_time(self) -> bool:
         """Report current time to server for Berkeley sync"""
         try:
             local_time = self._get_local_time()
-            result = self.proxy.report_time(self.roll, local_time)
-            
-            if result.get("success"):
-                # Apply correction from server
-                if "offset" in result:
-                    self.clock_offset = result["offset"]
-                    self._log_event("time_corrected", {
-                        "reported_time": local_time,
-                        "correction": result["offset"],
-                        "new_offset": self.clock_offset
-                    })
-                return True
-            else:
-                logger.error(f"Time report failed: {result.get('message')}")
-                return False
+            result = self._call("report_time", self.roll, local_time)
+            return self._apply_time_report(local_time, result)
         except Exception as e:
             logger.error(f"Time report error: {e}")
             return False
+
+    def report_time_batched(self) -> bool:
+        """Report time through the shared cross-student batcher"""
+        try:
+            local_time = self._get_local_time()
+            future = TimeReportBatcher.for_url(self.server_url).submit(
+                self.roll, local_time)
+            return self._apply_time_report(local_time, future.result(timeout=10))
+        except Exception as e:
+            logger.error(f"Batched time report error: {e}")
+            return False
+
+    def sync_with_server(self) -> bool:
+        """Report time and refresh status in one multicall round-trip
+
+        The behavior loop used to pay a full RTT each for report_time and
+        get_status; system.multicall carries both in a single HTTP exchange.
+        """
+        try:
+            local_time = self._get_local_time()
+            multicall = xmlrpc.client.MultiCall(self.proxy)
+            multicall.report_time(self.roll, local_time)
+            multicall.get_status(self.roll)
+            time_result, status_result = tuple(multicall())
+
+            ok = self._apply_time_report(local_time, time_result)
+            self._apply_status(status_result)
+            return ok
+        except Exception as e:
+            logger.error(f"Server sync error: {e}")
+            return False
     
     def simulate_cheating(self, evidence: str = "suspicious_activity") -> bool:
         """Simulate cheating detection and report to server"""
         try:
             self._log_event("cheating_detected", {"evidence": evidence})
-            result = self.proxy.cheating(self.roll, evidence)
+            result = self._call("cheating", self.roll, evidence)
             
             if result.get("success"):
                 action = result.get("action")
@@ -157,7 +411,7 @@ class StudentClient:
             self._log_event("cs_requested", {"timestamp": timestamp})
             
             # Send as string to avoid XML-RPC 32-bit int limit
-            result = self.proxy.request_cs(self.roll, str(timestamp))
+            result = self.proxy.request_cs(self.roll, _ts_str(timestamp))
             
             if result.get("success"):
                 if "holder" in result:
@@ -223,20 +477,23 @@ class StudentClient:
             logger.error(f"Submission error: {e}")
             return False
     
+    def _apply_status(self, result: Dict) -> Dict:
+        """Fold a get_status response into local state"""
+        if result.get("success"):
+            student_data = result.get("student", {})
+            self.exam_status = student_data.get("status", self.exam_status)
+            self.marks = student_data.get("marks", self.marks)
+            self.warnings = student_data.get("warnings", self.warnings)
+            self.clock_offset = student_data.get("clock_offset", self.clock_offset)
+        else:
+            logger.error(f"Status retrieval failed: {result.get('message')}")
+        return result
+
     def get_status(self) -> Dict:
         """Get current status from server"""
         try:
-            result = self.proxy.get_status(self.roll)
-            if result.get("success"):
-                student_data = result.get("student", {})
-                self.exam_status = student_data.get("status", self.exam_status)
-                self.marks = student_data.get("marks", self.marks)
-                self.warnings = student_data.get("warnings", self.warnings)
-                self.clock_offset = student_data.get("clock_offset", self.clock_offset)
-                return result
-            else:
-                logger.error(f"Status retrieval failed: {result.get('message')}")
-                return result
+            result = self._call("get_status", self.roll)
+            return self._apply_status(result)
         except Exception as e:
             logger.error(f"Status retrieval error: {e}")
             return {"success": False, "message": str(e)}
@@ -244,45 +501,39 @@ class StudentClient:
     def simulate_exam_behavior(self, duration: int = 300):
         """Simulate realistic exam behavior"""
         self.running = True
-        
-        def behavior_worker():
-            start_time = time.time()
-            last_activity = start_time
-            
-            while self.running and time.time() - start_time < duration:
-                try:
-                    # Random activities during exam
-                    activity = random.choice([
-                        "normal_work",
-                        "time_report",
-                        "cs_request",
-                        "cheating_simulation"
-                    ])
-                    
-                    if activity == "time_report":
-                        self.report_time()
-                    elif activity == "cs_request" and random.random() < 0.1:  # 10% chance
-                        if self.request_critical_section():
-                            time.sleep(random.uniform(2, 5))  # Work in CS
-                            self.release_critical_section()
-                    elif activity == "cheating_simulation" and random.random() < 0.05:  # 5% chance
-                        if self.exam_status == "in_progress":
-                            self.simulate_cheating(f"evidence_{int(time.time())}")
-                    
-                    # Update last activity
-                    self.last_activity = time.time()
-                    
-                    # Sleep for random interval
-                    time.sleep(random.uniform(5, 15))
-                    
-                except Exception as e:
-                    logger.error(f"Behavior simulation error: {e}")
-                    time.sleep(5)
-        
-        behavior_thread = threading.Thread(target=behavior_worker, daemon=True)
-        behavior_thread.start()
-        self.threads.append(behavior_thread)
-        
+        deadline = time.monotonic() + duration
+
+        def behavior_tick():
+            if not self.running or time.monotonic() >= deadline:
+                return
+            try:
+                # Random activities during exam
+                activity = self._rng.choice(_ACTIVITIES)
+
+                if activity == "time_report":
+                    # Many students tick concurrently; let their reports
+                    # share one batched RPC
+                    self.report_time_batched()
+                elif activity == "cs_request" and self._rng.random() < 0.1:  # 10% chance
+                    if self.request_critical_section():
+                        time.sleep(self._rng.uniform(2, 5))  # Work in CS
+                        self.release_critical_section()
+                elif activity == "cheating_simulation" and self._rng.random() < 0.05:  # 5% chance
+                    if self.exam_status == "in_progress":
+                        self.simulate_cheating(f"evidence_{int(time.time())}")
+
+                # Update last activity
+                self.last_activity = time.time()
+
+                # Reschedule after a random interval
+                self._schedule(self._rng.uniform(5, 15), behavior_tick)
+
+            except Exception as e:
+                logger.error(f"Behavior simulation error: {e}")
+                self._schedule(5, behavior_tick)
+
+        self._schedule(self._rng.uniform(0, 1), behavior_tick)
+
         self._log_event("behavior_simulation_started", {"duration": duration})
     
     def stop(self):
@@ -308,9 +559,9 @@ class StudentClient:
             print("Failed to start exam!")
             return
         
-        # Report time
+        # Report time and pick up current status in one round-trip
         print("3. Reporting time for Berkeley sync...")
-        self.report_time()
+        self.sync_with_server()
         
         # Simulate some activities
         print("4. Simulating exam activities...")
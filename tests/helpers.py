@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the unit test suite
+"""
+
+from unittest.mock import MagicMock
+
+def _make_proxy(**calls):
+    """Build a mock proxy with RPC return values configured in one batch
+
+    ServerProxy synthesizes methods through __getattr__, so spec'ing the
+    mock against it would reject every RPC name; a plain MagicMock plus a
+    single configure_mock call keeps setup to one dict walk.
+    """
+    proxy = MagicMock()
+    proxy.configure_mock(
+        **{f"{name}.return_value": value for name, value in calls.items()})
+    return proxy
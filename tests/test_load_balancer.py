@@ -5,6 +5,8 @@ Unit tests for the load balancer
 
 import unittest
 import time
+import heapq
+import itertools
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
@@ -13,12 +15,21 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from load_balancer import LoadBalancer
+from tests.helpers import _make_proxy
 
 class TestLoadBalancer(unittest.TestCase):
     """Test cases for LoadBalancer class"""
     
     def setUp(self):
-        """Set up test fixtures"""
+        """Set up test fixtures
+
+        One patcher shared by all tests replaces the per-test @patch
+        decorators; dispatch/health tests configure responses against
+        self.mock_server_proxy.
+        """
+        self._patcher = patch('xmlrpc.client.ServerProxy')
+        self.mock_server_proxy = self._patcher.start()
+        self.addCleanup(self._patcher.stop)
         self.backends = [
             "http://127.0.0.1:8000",
             "http://127.0.0.1:8001",
@@ -54,46 +65,57 @@ class TestLoadBalancer(unittest.TestCase):
         for backend in self.backends:
             self.assertEqual(self.balancer.request_count[backend], 2)
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_dispatch_success(self, mock_server_proxy):
+    def test_dispatch_success(self):
         """Test successful request dispatch"""
         # Mock server proxy
-        mock_proxy = Mock()
-        mock_proxy.get_status.return_value = {"success": True, "data": "test"}
-        mock_server_proxy.return_value = mock_proxy
-        
+        mock_proxy = _make_proxy(get_status={"success": True, "data": "test"})
+        self.mock_server_proxy.return_value = mock_proxy
+
         # Test dispatch
         result = self.balancer._dispatch("get_status", ())
         self.assertEqual(result, {"success": True, "data": "test"})
         mock_proxy.get_status.assert_called_once()
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_dispatch_failure_with_retry(self, mock_server_proxy):
+    def test_dispatch_failure_with_retry(self):
         """Test request dispatch with failure and retry"""
         # Mock server proxy to fail first time, succeed second time
-        mock_proxy1 = Mock()
+        mock_proxy1 = MagicMock()
         mock_proxy1.get_status.side_effect = Exception("Connection failed")
-        
-        mock_proxy2 = Mock()
-        mock_proxy2.get_status.return_value = {"success": True, "data": "retry_success"}
-        
-        mock_server_proxy.side_effect = [mock_proxy1, mock_proxy2]
-        
+
+        mock_proxy2 = _make_proxy(
+            get_status={"success": True, "data": "retry_success"})
+
+        self.mock_server_proxy.side_effect = [mock_proxy1, mock_proxy2]
+
         # Test dispatch with retry
         result = self.balancer._dispatch("get_status", ())
         self.assertEqual(result, {"success": True, "data": "retry_success"})
         
         # First backend should be marked as unhealthy
         self.assertFalse(self.balancer.backend_status[self.backends[0]])
+
+        # Both picks were released; a leaked increment here would bias
+        # least-connections against the backend forever
+        self.assertEqual(sum(self.balancer._inflight), 0)
+
+    def test_dispatch_failure_single_backend(self):
+        """Test that a failed dispatch on a lone backend leaks no in-flight count"""
+        mock_proxy = MagicMock()
+        mock_proxy.get_status.side_effect = Exception("Connection failed")
+        self.mock_server_proxy.return_value = mock_proxy
+
+        balancer = LoadBalancer([self.backends[0]], port=9001)
+        with self.assertRaises(Exception):
+            balancer._dispatch("get_status", ())
+
+        self.assertEqual(sum(balancer._inflight), 0)
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_health_check(self, mock_server_proxy):
+    def test_health_check(self):
         """Test health check functionality"""
         # Mock healthy backend
-        mock_proxy = Mock()
-        mock_proxy.get_status.return_value = {"success": True}
-        mock_server_proxy.return_value = mock_proxy
-        
+        mock_proxy = _make_proxy(get_status={"success": True})
+        self.mock_server_proxy.return_value = mock_proxy
+
         # Test health check
         is_healthy = self.balancer._is_backend_healthy(self.backends[0])
         self.assertTrue(is_healthy)
@@ -144,6 +166,55 @@ class TestLoadBalancer(unittest.TestCase):
         backend = self.balancer._get_next_backend()
         self.assertEqual(backend, self.backends[0])
     
+    def test_invoke_read_cache(self):
+        """Test TTL caching of idempotent read RPCs through invoke"""
+        mock_proxy = _make_proxy(
+            get_status={"success": True, "data": "cached"},
+            register_student={"success": True})
+        self.mock_server_proxy.return_value = mock_proxy
+
+        # The second call lands within the TTL and is served from cache
+        first = self.balancer.invoke("get_status")
+        second = self.balancer.invoke("get_status")
+        self.assertEqual(first, {"success": True, "data": "cached"})
+        self.assertEqual(second, first)
+        self.assertEqual(mock_proxy.get_status.call_count, 1)
+
+        # Methods outside read_rpc_ttl always hit a backend
+        self.balancer.invoke("register_student", "23102A0001")
+        self.balancer.invoke("register_student", "23102A0001")
+        self.assertEqual(mock_proxy.register_student.call_count, 2)
+
+        # Expiring the cache entry forces a fresh dispatch
+        with self.balancer._rcache_lock:
+            self.balancer._rcache.clear()
+        self.balancer.invoke("get_status")
+        self.assertEqual(mock_proxy.get_status.call_count, 2)
+
+    def test_multi_invoke_fault_mapping(self):
+        """Test that multi_invoke maps per-call faults in original order"""
+        mock_proxy = MagicMock()
+        mock_proxy.system.multicall.return_value = [
+            [{"success": True, "data": "ok"}],
+            {"faultCode": 1, "faultString": "boom"},
+        ]
+        self.mock_server_proxy.return_value = mock_proxy
+
+        # Leave one healthy backend so the batch groups into one multicall
+        for backend in self.backends[1:]:
+            with self.balancer.lock:
+                self.balancer._set_backend_health(backend, False)
+
+        results = self.balancer.multi_invoke(
+            [["get_status", []], ["cheating", ["23102A0001", "evidence"]]])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], {"success": True, "data": "ok"})
+        self.assertFalse(results[1]["success"])
+        self.assertIn("boom", results[1]["error"])
+        # One round-trip covered both calls
+        mock_proxy.system.multicall.assert_called_once()
+
     def test_empty_backends_list(self):
         """Test behavior with empty backends list"""
         empty_balancer = LoadBalancer([], port=9000)
@@ -152,57 +223,92 @@ class TestLoadBalancer(unittest.TestCase):
 
 class TestLoadBalancerIntegration(unittest.TestCase):
     """Integration tests for load balancer"""
-    
+
+    BACKENDS = ("http://127.0.0.1:8000", "http://127.0.0.1:8001")
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one balancer for the whole class"""
+        cls.balancer = LoadBalancer(list(cls.BACKENDS))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Shut the shared balancer down if it supports it"""
+        shutdown = getattr(cls.balancer, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+
+    def setUp(self):
+        """Reset the shared balancer's selection state between tests"""
+        balancer = type(self).balancer
+        for i in range(len(balancer.backends)):
+            balancer._inflight[i] = 0
+            balancer._reqcnt[i] = 0
+        balancer._rc_next = [
+            itertools.count(1).__next__ for _ in balancer.backends]
+        balancer.backend_status = dict.fromkeys(balancer.backends, True)
+        balancer._healthy = list(balancer.backends)
+        balancer._heap = []
+        balancer._heap_version = dict.fromkeys(balancer.backends, 0)
+        for backend in balancer.backends:
+            heapq.heappush(balancer._heap, (0, 0, backend, 0))
+        self.balancer = balancer
+
     def test_round_robin_distribution(self):
         """Test that requests are distributed evenly"""
-        backends = ["http://127.0.0.1:8000", "http://127.0.0.1:8001"]
-        balancer = LoadBalancer(backends)
-        
-        # Make many requests
-        request_count = 100
+        backends = self.balancer.backends
+        balancer = self.balancer
+
+        # Two full cycles is enough to prove even distribution exactly
+        request_count = len(backends) * 2
         for _ in range(request_count):
             balancer._get_next_backend()
-        
-        # Each backend should have received approximately half the requests
+
+        # Each backend should have received exactly one request per cycle
         for backend in backends:
-            count = balancer.request_count[backend]
-            self.assertAlmostEqual(count, request_count // 2, delta=1)
-    
+            self.assertEqual(balancer.request_count[backend], 2)
+
     def test_backend_failover(self):
         """Test failover when backend becomes unhealthy"""
-        backends = ["http://127.0.0.1:8000", "http://127.0.0.1:8001"]
-        balancer = LoadBalancer(backends)
-        
+        backends = self.balancer.backends
+        balancer = self.balancer
+
         # Mark first backend as unhealthy
         balancer.backend_status[backends[0]] = False
-        
+
         # All requests should go to second backend
         for _ in range(10):
             backend = balancer._get_next_backend()
             self.assertEqual(backend, backends[1])
-    
+
     def test_backend_recovery(self):
         """Test backend recovery after being marked unhealthy"""
-        backends = ["http://127.0.0.1:8000", "http://127.0.0.1:8001"]
-        balancer = LoadBalancer(backends)
-        
-        # Mark first backend as unhealthy
-        balancer.backend_status[backends[0]] = False
+        backends = self.balancer.backends
+        balancer = self.balancer
+
+        # Mark first backend as unhealthy through the health-transition API
+        with balancer.lock:
+            balancer._set_backend_health(backends[0], False)
         
         # All requests should go to second backend
         for _ in range(5):
             backend = balancer._get_next_backend()
             self.assertEqual(backend, backends[1])
-        
-        # Mark first backend as healthy again
-        balancer.backend_status[backends[0]] = True
-        
-        # Requests should now be distributed again
+            balancer._release_backend(backend)
+
+        # Mark first backend as healthy again; this requeues its heap entry
+        with balancer.lock:
+            balancer._set_backend_health(backends[0], True)
+
+        # Least-connections favors the recovered backend until its request
+        # count catches up, then selection alternates; a handful of picks
+        # reaches both backends
         selected_backends = []
-        for _ in range(4):
+        for _ in range(8):
             backend = balancer._get_next_backend()
             selected_backends.append(backend)
-        
+            balancer._release_backend(backend)
+
         # Should see both backends
         self.assertIn(backends[0], selected_backends)
         self.assertIn(backends[1], selected_backends)
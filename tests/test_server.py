@@ -6,6 +6,8 @@ Unit tests for the exam coordinator server
 import unittest
 import time
 import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from unittest.mock import Mock, patch
 import sys
 import os
@@ -15,17 +17,54 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server import ExamCoordinator
 
+def _reset_coordinator(coordinator):
+    """Return a shared coordinator to its freshly-constructed state
+
+    The constructor starts a log-writer thread, so building one per test
+    leaks threads and repeats setup work; resetting the mutable state is
+    enough between tests.
+    """
+    coordinator.students.clear()
+    coordinator.exam_started = False
+    coordinator.exam_ended = False
+    coordinator.exam_start_monotonic = None
+    coordinator.lamport_clock = 0
+    coordinator._local_clock = itertools.count(1)
+    coordinator.cs_holder = None
+    coordinator.cs_queue.clear()
+    coordinator._queue_rolls.clear()
+    coordinator.received_replies.clear()
+    coordinator.pending_requests.clear()
+    coordinator.answers.clear()
+    coordinator.final_submissions.clear()
+    coordinator._submissions_in_progress.clear()
+    coordinator.time_sync_data.clear()
+    coordinator.last_sync_time = 0
+
 class TestExamCoordinator(unittest.TestCase):
     """Test cases for ExamCoordinator class"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one coordinator for the whole class"""
+        cls.coordinator = ExamCoordinator(port=8000, replica_id="test")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Shut the shared coordinator down if it supports it"""
+        shutdown = getattr(cls.coordinator, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+
     def setUp(self):
         """Set up test fixtures"""
-        self.coordinator = ExamCoordinator(port=8000, replica_id="test")
-    
+        self.coordinator = type(self).coordinator
+        _reset_coordinator(self.coordinator)
+
     def tearDown(self):
         """Clean up after tests"""
         pass
-    
+
     def test_register_student(self):
         """Test student registration"""
         # Test successful registration
@@ -199,37 +238,126 @@ class TestExamCoordinator(unittest.TestCase):
         clock3 = self.coordinator._increment_lamport_clock(500)
         self.assertEqual(clock3, 1002)  # Should use current clock + 1
     
+    def test_submit_answers_batch(self):
+        """Test coalesced batch answer writes"""
+        self.coordinator.register_student("23102A0001")
+
+        # Timestamps travel as strings to dodge XML-RPC i4 limits
+        result = self.coordinator.submit_answers_batch(
+            "23102A0001", [[1, "4", "100"], [2, "Paris", "101"]], "autosave")
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["results"]), 2)
+        for item in result["results"]:
+            self.assertTrue(item["success"])
+
+        answers = self.coordinator.answers["23102A0001"]
+        self.assertEqual(answers[1].value, "4")
+        self.assertEqual(answers[2].value, "Paris")
+
+        # A later write for the same question wins and bumps the version
+        again = self.coordinator.submit_answer("23102A0001", 1, "5")
+        self.assertTrue(again["success"])
+        self.assertEqual(answers[1].value, "5")
+        self.assertEqual(answers[1].version, 2)
+
+        # An unknown roll is rejected per entry, not for the whole batch
+        result = self.coordinator.submit_answers_batch(
+            "invalid_roll", [[1, "4", "100"]], "autosave")
+        self.assertTrue(result["success"])
+        self.assertFalse(result["results"][0]["success"])
+
+    def test_autosave_after_final_submission(self):
+        """Test that stale autosaves are rejected after final submission"""
+        self.coordinator.register_student("23102A0001")
+        self.coordinator.submit_exam("23102A0001", "manual")
+
+        # An autosave carrying a Lamport ts at or below the final
+        # submission's loses the conflict resolution
+        final_ts = self.coordinator.final_submissions["23102A0001"]["lamport_ts"]
+        result = self.coordinator.submit_answer("23102A0001", 1, "4", final_ts, "autosave")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["reason"], "finalized")
+
+        # An autosave that causally follows the final submission still lands
+        result = self.coordinator.submit_answer("23102A0001", 1, "4", final_ts + 1, "autosave")
+        self.assertTrue(result["success"])
+
+    def test_wait_for_change(self):
+        """Test long-poll state change notification"""
+        version = self.coordinator.state_version
+
+        # A stale client version returns immediately with the current state
+        result = self.coordinator.wait_for_change(version - 1, 1)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["version"], version)
+        self.assertIn("students", result)
+
+        # An up-to-date client blocks until something changes
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.coordinator.wait_for_change, version, 5)
+            time.sleep(0.1)  # let the poller park on the condition
+            self.coordinator.register_student("23102A0001")
+            result = future.result(timeout=2)
+
+        self.assertTrue(result["success"])
+        self.assertGreater(result["version"], version)
+        self.assertIn("23102A0001", result["students"])
+
+        # Timeout expires as a keepalive heartbeat when nothing changes
+        current = self.coordinator.state_version
+        start = time.monotonic()
+        result = self.coordinator.wait_for_change(current, 0.2)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["version"], current)
+
     def test_conflict_resolution(self):
         """Test conflict resolution for simultaneous submissions"""
         # Register a student
         self.coordinator.register_student("23102A0001")
-        
-        # Simulate simultaneous submissions
-        def submit_exam_async(mode, delay=0):
-            time.sleep(delay)
+
+        # Release both submissions within microseconds of each other so the
+        # calls actually race instead of running back to back
+        barrier = threading.Barrier(2)
+
+        def submit_exam_async(mode):
+            barrier.wait()
             return self.coordinator.submit_exam("23102A0001", mode)
-        
-        # Start two submission threads
-        thread1 = threading.Thread(target=submit_exam_async, args=("manual", 0.1))
-        thread2 = threading.Thread(target=submit_exam_async, args=("auto", 0.2))
-        
-        thread1.start()
-        thread2.start()
-        
-        thread1.join()
-        thread2.join()
-        
-        # Check that only one submission was successful
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(submit_exam_async, mode)
+                for mode in ("manual", "auto")
+            ]
+            results = [future.result() for future in as_completed(futures)]
+
+        # Exactly one submission wins, whatever the scheduling
+        successes = [r for r in results if r["success"]]
+        self.assertEqual(len(successes), 1)
+
         student = self.coordinator.students["23102A0001"]
         self.assertEqual(student["status"], "submitted")
         self.assertIn(student["submission_mode"], ["manual", "auto"])
 
 class TestExamCoordinatorIntegration(unittest.TestCase):
     """Integration tests for the exam coordinator"""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one coordinator for the whole class"""
+        cls.coordinator = ExamCoordinator(port=8000, replica_id="test")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Shut the shared coordinator down if it supports it"""
+        shutdown = getattr(cls.coordinator, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+
     def setUp(self):
         """Set up integration test fixtures"""
-        self.coordinator = ExamCoordinator(port=8000, replica_id="test")
+        self.coordinator = type(self).coordinator
+        _reset_coordinator(self.coordinator)
     
     def test_full_exam_workflow(self):
         """Test complete exam workflow"""
@@ -5,6 +5,8 @@ Unit tests for the student client
 
 import unittest
 import time
+import random
+import threading
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
@@ -12,20 +14,39 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from student_client import StudentClient
+from student_client import StudentClient, TimeReportBatcher
+from tests.helpers import _make_proxy
 
 class TestStudentClient(unittest.TestCase):
     """Test cases for StudentClient class"""
-    
+
     def setUp(self):
-        """Set up test fixtures"""
+        """Set up test fixtures
+
+        One patcher started before the client is built replaces the
+        per-test @patch decorators: the client's proxy is the mock from
+        construction on, and each test configures responses against
+        self.mock_proxy.
+        """
+        self._patcher = patch('xmlrpc.client.ServerProxy')
+        self.mock_server_proxy = self._patcher.start()
+        self.addCleanup(self._patcher.stop)
+        self.mock_server_proxy.return_value = _make_proxy()
+        self.mock_proxy = self.mock_server_proxy.return_value
+        # The batcher caches instances (and their proxies) per URL; clear
+        # it so no stale mock from a previous test leaks in
+        TimeReportBatcher._instances.clear()
+        # use_fast_path=False keeps every RPC on the mocked proxy; the
+        # template fast path would otherwise open a real connection to
+        # the coordinator port and bypass the mock if a server is running
         self.student = StudentClient(
             roll="23102A0001",
             server_url="http://127.0.0.1:8000",
             clock_skew=2.0,
-            name="TestStudent"
+            name="TestStudent",
+            use_fast_path=False
         )
-    
+
     def tearDown(self):
         """Clean up after tests"""
         self.student.stop()
@@ -67,76 +88,64 @@ class TestStudentClient(unittest.TestCase):
         clock3 = self.student._increment_lamport_clock(50)
         self.assertEqual(clock3, 102)  # Should use current clock + 1
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_register(self, mock_server_proxy):
+    def test_register(self):
         """Test student registration"""
         # Mock server response
-        mock_proxy = Mock()
-        mock_proxy.register_student.return_value = {"success": True, "message": "Student registered"}
-        mock_server_proxy.return_value = mock_proxy
-        
+        self.mock_proxy.register_student.return_value = {"success": True, "message": "Student registered"}
+
         # Test successful registration
         result = self.student.register()
         self.assertTrue(result)
-        mock_proxy.register_student.assert_called_once_with("23102A0001")
-        
+        self.mock_proxy.register_student.assert_called_once_with("23102A0001")
+
         # Test failed registration
-        mock_proxy.register_student.return_value = {"success": False, "message": "Registration failed"}
+        self.mock_proxy.register_student.return_value = {"success": False, "message": "Registration failed"}
         result = self.student.register()
         self.assertFalse(result)
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_start_exam(self, mock_server_proxy):
+    def test_start_exam(self):
         """Test exam start functionality"""
         # Mock server response
-        mock_proxy = Mock()
-        mock_proxy.get_status.return_value = {
+        self.mock_proxy.wait_for_change.return_value = {
             "success": True,
             "exam_started": True,
-            "student": {"status": "in_progress"}
+            "version": 1
         }
-        mock_server_proxy.return_value = mock_proxy
-        
+
         # Test exam start
         result = self.student.start_exam()
         self.assertTrue(result)
         self.assertEqual(self.student.exam_status, "in_progress")
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_report_time(self, mock_server_proxy):
+    def test_report_time(self):
         """Test time reporting functionality"""
         # Mock server response
-        mock_proxy = Mock()
-        mock_proxy.report_time.return_value = {"success": True, "offset": 1.5}
-        mock_server_proxy.return_value = mock_proxy
-        
+        self.mock_proxy.report_time.return_value = {"success": True, "offset": 1.5}
+
         # Test time reporting
         result = self.student.report_time()
         self.assertTrue(result)
         self.assertEqual(self.student.clock_offset, 1.5)
-        mock_proxy.report_time.assert_called_once()
+        self.mock_proxy.report_time.assert_called_once()
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_simulate_cheating(self, mock_server_proxy):
+    def test_simulate_cheating(self):
         """Test cheating simulation"""
         # Mock server response for first offense
-        mock_proxy = Mock()
-        mock_proxy.cheating.return_value = {
+        self.mock_proxy.cheating.return_value = {
             "success": True,
             "action": "warning",
             "new_marks": 50.0
         }
-        mock_server_proxy.return_value = mock_proxy
-        
+
         # Test first cheating offense
         result = self.student.simulate_cheating("evidence")
         self.assertTrue(result)
         self.assertEqual(self.student.warnings, 1)
         self.assertEqual(self.student.marks, 50.0)
         self.assertEqual(self.student.exam_status, "warned")
-        
+
         # Mock server response for second offense
-        mock_proxy.cheating.return_value = {
+        self.mock_proxy.cheating.return_value = {
             "success": True,
             "action": "terminated"
         }
@@ -148,47 +157,39 @@ class TestStudentClient(unittest.TestCase):
         self.assertEqual(self.student.marks, 0.0)
         self.assertEqual(self.student.exam_status, "terminated")
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_request_critical_section(self, mock_server_proxy):
+    def test_request_critical_section(self):
         """Test critical section request"""
         # Mock server response
-        mock_proxy = Mock()
-        mock_proxy.request_cs.return_value = {
+        self.mock_proxy.request_cs.return_value = {
             "success": True,
             "message": "Request queued",
             "position": 1
         }
-        mock_server_proxy.return_value = mock_proxy
-        
+
         # Test CS request
         result = self.student.request_critical_section()
         self.assertFalse(result)  # Not granted immediately
-        mock_proxy.request_cs.assert_called_once()
+        self.mock_proxy.request_cs.assert_called_once()
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_submit_exam(self, mock_server_proxy):
+    def test_submit_exam(self):
         """Test exam submission"""
         # Mock server response
-        mock_proxy = Mock()
-        mock_proxy.submit_exam.return_value = {
+        self.mock_proxy.submit_exam.return_value = {
             "success": True,
             "message": "Exam submitted successfully",
             "final_marks": 85.0
         }
-        mock_server_proxy.return_value = mock_proxy
-        
+
         # Test exam submission
         result = self.student.submit_exam("manual")
         self.assertTrue(result)
         self.assertEqual(self.student.exam_status, "submitted")
-        mock_proxy.submit_exam.assert_called_once_with("23102A0001", "manual")
+        self.mock_proxy.submit_exam.assert_called_once_with("23102A0001", "manual")
     
-    @patch('xmlrpc.client.ServerProxy')
-    def test_get_status(self, mock_server_proxy):
+    def test_get_status(self):
         """Test status retrieval"""
         # Mock server response
-        mock_proxy = Mock()
-        mock_proxy.get_status.return_value = {
+        self.mock_proxy.get_status.return_value = {
             "success": True,
             "student": {
                 "status": "in_progress",
@@ -197,8 +198,7 @@ class TestStudentClient(unittest.TestCase):
                 "clock_offset": 1.0
             }
         }
-        mock_server_proxy.return_value = mock_proxy
-        
+
         # Test status retrieval
         result = self.student.get_status()
         self.assertTrue(result["success"])
@@ -222,29 +222,43 @@ class TestStudentClient(unittest.TestCase):
     
     def test_behavior_simulation(self):
         """Test behavior simulation"""
-        # Mock server proxy
-        with patch('xmlrpc.client.ServerProxy') as mock_server_proxy:
-            mock_proxy = Mock()
-            mock_proxy.get_status.return_value = {
+        self.mock_proxy.configure_mock(**{
+            "get_status.return_value": {
                 "success": True,
                 "exam_started": True,
                 "student": {"status": "in_progress"}
-            }
-            mock_proxy.report_time.return_value = {"success": True, "offset": 0.0}
-            mock_proxy.cheating.return_value = {"success": True, "action": "warning", "new_marks": 50.0}
-            mock_server_proxy.return_value = mock_proxy
-            
-            # Start behavior simulation
-            self.student.simulate_exam_behavior(1)  # 1 second simulation
-            
-            # Let it run briefly
-            time.sleep(0.5)
-            
-            # Stop simulation
-            self.student.stop()
-            
-            # Verify some methods were called
-            self.assertTrue(mock_proxy.get_status.called or mock_proxy.report_time.called)
+            },
+            "report_time.return_value": {"success": True, "offset": 0.0},
+            "cheating.return_value": {
+                "success": True, "action": "warning", "new_marks": 50.0
+            },
+        })
+        # Signal the moment the first tick reaches the server, so the test
+        # waits exactly as long as the simulation needs and no longer
+        first_call = threading.Event()
+
+        def batch_reply(reports):
+            first_call.set()
+            return {"success": True, "offsets": {"23102A0001": 0.0}}
+
+        self.mock_proxy.report_times_batch.side_effect = batch_reply
+
+        # Pin the behavior RNG so the first tick fires quickly and picks a
+        # time report, instead of depending on hash randomization
+        self.student._rng = random.Random(14)
+
+        # Start behavior simulation
+        self.student.simulate_exam_behavior(2)  # 2 second simulation
+
+        # Park until the first tick lands instead of sleeping a fixed slice
+        first_call.wait(timeout=2.0)
+
+        # Stop simulation
+        self.student.stop()
+
+        # Verify some methods were called
+        self.assertTrue(self.mock_proxy.report_time.called
+                        or self.mock_proxy.report_times_batch.called)
 
 class TestStudentClientIntegration(unittest.TestCase):
     """Integration tests for student client"""
@@ -252,22 +266,24 @@ class TestStudentClientIntegration(unittest.TestCase):
     def test_full_student_workflow(self):
         """Test complete student workflow"""
         with patch('xmlrpc.client.ServerProxy') as mock_server_proxy:
-            mock_proxy = Mock()
+            # Mock all server responses in one batch
+            mock_proxy = _make_proxy(
+                register_student={"success": True},
+                get_status={
+                    "success": True,
+                    "exam_started": True,
+                    "student": {"status": "in_progress"}
+                },
+                wait_for_change={"success": True, "exam_started": True},
+                report_time={"success": True, "offset": 1.0},
+                cheating={"success": True, "action": "warning", "new_marks": 50.0},
+                submit_exam={"success": True, "final_marks": 50.0},
+            )
             mock_server_proxy.return_value = mock_proxy
-            
-            # Mock all server responses
-            mock_proxy.register_student.return_value = {"success": True}
-            mock_proxy.get_status.return_value = {
-                "success": True,
-                "exam_started": True,
-                "student": {"status": "in_progress"}
-            }
-            mock_proxy.report_time.return_value = {"success": True, "offset": 1.0}
-            mock_proxy.cheating.return_value = {"success": True, "action": "warning", "new_marks": 50.0}
-            mock_proxy.submit_exam.return_value = {"success": True, "final_marks": 50.0}
-            
-            # Create student
-            student = StudentClient("23102A0001", clock_skew=2.0)
+
+            # Create student (fast path off so the mock sees every call)
+            student = StudentClient("23102A0001", clock_skew=2.0,
+                                    use_fast_path=False)
             
             # Test full workflow
             self.assertTrue(student.register())